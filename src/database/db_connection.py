@@ -1,12 +1,48 @@
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import oracledb
 from environs import env
 
 from src.logger.Logger import Logger
 
+# Pool sesija se kreira jednom po procesu za svakog korisnika i DSN (kod prvog
+# connect poziva). Sa DRCP-om (DB_HOST sa :pooled) sesije se dijele i između
+# pokretanja skripti.
+_POOLS: Dict[Tuple[str, str], oracledb.ConnectionPool] = {}
+
+
+def _get_pool(user: str, password: str, dsn: str) -> oracledb.ConnectionPool:
+    """
+    Dohvaćanje (i kreiranje kod prvog poziva) pool-a sesija na Oracle DB za
+    proslijeđenog korisnika i DSN.
+
+    Args:
+        user (str): Korisničko ime.
+        password (str): Lozinka.
+        dsn (str): Oracle DB host (host:port/service_name).
+
+    Returns:
+        oracledb.ConnectionPool: Pool sesija na Oracle DB.
+    """
+    key = (user, dsn)
+
+    if key not in _POOLS:
+        _POOLS[key] = oracledb.create_pool(
+            user=user,
+            password=password,
+            dsn=dsn,
+            min=1,
+            max=8,
+            increment=1,
+            homogeneous=True,
+            cclass="PMCT",
+            purity=oracledb.PURITY_SELF,
+        )
+
+    return _POOLS[key]
+
 
 class OracleDBConn:
     """
@@ -50,7 +86,7 @@ class OracleDBConn:
         """
         Kreiranje konekcije na Oracle DB.
 
-        Uspostavlja konekciju sa Oracle DB koristeći podatke iz .env datoteke
+        Uzima konekciju iz pool-a sesija na Oracle DB (podaci iz .env datoteke)
         i postavlja cursor za izvršavanje upita.
         """
         if self.is_connected:
@@ -61,9 +97,9 @@ class OracleDBConn:
             logging.info("-" * 100)
             logging.info(f"Spajanje na bazu podataka: {self.dsn}...")
 
-            self.connection = oracledb.connect(
-                user=self.username, password=self.password, dsn=self.dsn
-            )
+            self.connection = _get_pool(
+                self.username, self.password, self.dsn
+            ).acquire()
 
             self.cursor = self.connection.cursor()
             # Ovo je potrebno za produkcijsku bazu jer se inače dobije 'ORA 01843:not a valid month' greška
@@ -100,6 +136,7 @@ class OracleDBConn:
                 self.cursor.close()
                 logging.info("Cursor baze podataka zatvoren.")
             if self.connection:
+                # Konekcija iz pool-a se kod close vraća u pool
                 self.connection.close()
                 logging.info("Konekcija s bazom podataka prekinuta.")
         except oracledb.Error as e:
@@ -204,19 +241,31 @@ class OracleDBConn:
             self.connection.rollback()
             raise
 
-    def execute_many(self, query: str, params_list: List[Dict[str, Any]]) -> int:
+    def execute_many(
+        self,
+        query: str,
+        params_list: List[Dict[str, Any]],
+        commit: bool = True,
+        skip_duplicates: bool = False,
+    ) -> int:
         """
         Izvršavanje batch upita sa dictionary listom parametara.
 
         Args:
             query (str): SQL upit za izvršiti.
             params_list (List[Dict[str, Any]]): Lista dictionarya sa parametrima.
+            commit (bool): Ako je False, commit radi pozivatelj (npr. nakon zadnjeg od
+                           više batcheva, pogledati commit). Default = True
+            skip_duplicates (bool): Ako je True, redci koji već postoje u bazi
+                                    (ORA-00001) se preskaču kao i u execute_query.
+                                    Default = False
 
         Returns:
             int: Broj zapisanih redaka
 
         Raises:
-            RuntimeError: Ako konekcija nije aktivna.
+            RuntimeError: Ako konekcija nije aktivna ili ako pojedini redci nije moguće
+                          zapisati (kod skip_duplicates=True, osim duplikata).
             oracledb.Error: Za Oracle DB greške.
             Exception: Za ostale greške tokom izvršavanja.
         """
@@ -235,8 +284,32 @@ class OracleDBConn:
             )
             logging.info("-" * 100)
 
-            self.cursor.executemany(query, params_list)
-            self.connection.commit()
+            if skip_duplicates:
+                # Sa batcherrors=True neispravni redci ne prekidaju cijeli batch, nego
+                # se dohvaćaju nakon izvršavanja. Duplikati (ORA-00001) se preskaču, a
+                # za ostale greške se radi rollback cijele transakcije.
+                self.cursor.executemany(query, params_list, batcherrors=True)
+
+                batch_errors = self.cursor.getbatcherrors()
+                duplikati = [err for err in batch_errors if "ORA-00001" in err.message]
+                ostale_greske = [
+                    err for err in batch_errors if "ORA-00001" not in err.message
+                ]
+
+                if duplikati:
+                    logging.warning(
+                        f"Preskačem {len(duplikati)} redaka jer već postoje u bazi!"
+                    )
+                if ostale_greske:
+                    raise RuntimeError(
+                        f"{len(ostale_greske)} redaka nije moguće zapisati "
+                        f"(prvi redak {ostale_greske[0].offset}): {ostale_greske[0].message}"
+                    )
+            else:
+                self.cursor.executemany(query, params_list)
+
+            if commit:
+                self.connection.commit()
             affected_rows = self.cursor.rowcount
 
             logging.info(
@@ -248,6 +321,7 @@ class OracleDBConn:
         except oracledb.Error as e:
             error_msg = f"Izvršavanje batch upita nije uspjelo: {str(e)}"
             logging.error(error_msg, exc_info=True)
+            # Rollback poništava i batcheve koji su izvršeni sa commit=False
             self.connection.rollback()
             raise
         except Exception as e:
@@ -256,6 +330,76 @@ class OracleDBConn:
             self.connection.rollback()
             raise
 
+    def commit(self) -> None:
+        """
+        Commit transakcije (npr. nakon više execute_many poziva sa commit=False).
+
+        Raises:
+            RuntimeError: Ako konekcija nije aktivna.
+        """
+        if not self.is_connected or not self.connection:
+            error_msg = "Konekcija s bazom podataka ne postoji!"
+            logging.error(error_msg)
+            raise RuntimeError(error_msg)
+
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        """
+        Rollback transakcije (poništava sve što nije commitano).
+        """
+        if self.is_connected and self.connection:
+            self.connection.rollback()
+
+    def execute_returning(
+        self, query: str, params: Dict[str, Any], out_vars: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Izvršavanje upita ili PL/SQL bloka sa izlaznim (OUT) bind varijablama.
+
+        Args:
+            query (str): SQL upit ili PL/SQL blok za izvršiti.
+            params (Dict[str, Any]): Parametri za parametrizirane upite.
+            out_vars (List[str]): Nazivi izlaznih bind varijabli (brojevi).
+
+        Returns:
+            Dict[str, Any]: Vrijednosti izlaznih varijabli prema nazivu.
+
+        Raises:
+            RuntimeError: Ako konekcija nije aktivna.
+            oracledb.Error: Za Oracle DB greške.
+            Exception: Za ostale greške tokom izvršavanja.
+        """
+        if not self.is_connected or not self.connection or not self.cursor:
+            error_msg = "Konekcija s bazom podataka ne postoji!"
+            logging.error(error_msg)
+            raise RuntimeError(error_msg)
+
+        try:
+            logging.info(f"Izvršavanje upita: {query} za parametre {params}")
+            logging.info("-" * 100)
+
+            out_bind = {name: self.cursor.var(int) for name in out_vars}
+            self.cursor.execute(query, {**params, **out_bind})
+            self.connection.commit()
+
+            results = {name: var.getvalue() for name, var in out_bind.items()}
+
+            logging.info(f"Upit uspješno izvršen i potvrđen - {results}")
+            logging.info("-" * 100)
+
+            return results
+        except oracledb.Error as e:
+            error_msg = f"Izvršavanje upita nije uspjelo (DB): {str(e)}"
+            logging.error(error_msg, exc_info=True)
+            self.connection.rollback()
+            raise
+        except Exception as e:
+            error_msg = f"Greška prilikom izvršavanja upita: {str(e)}"
+            logging.error(error_msg, exc_info=True)
+            self.connection.rollback()
+            raise
+
     def is_connection_active(self) -> bool:
         """
         Provjera da li je konekcija aktivna.
@@ -6,19 +6,17 @@ from urllib.parse import quote, unquote
 
 import pandas as pd
 from boso_utils import clean_naziv, get_all_files
-from data_utils import create_folders, remove_decimals, to_decimal
+from data_utils import create_folders, normalize_price_column
 from db_utils import (
-    get_datoteka_id_and_status,
     get_id_naselja,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     insert_new_prodajni_objekt,
     update_datoteka_status,
+    upsert_datoteka,
 )
-from environs import env
 from web_utils import find_encoding
 
 from src.database.db_connection import OracleDBConn
@@ -26,8 +24,9 @@ from src.models.TrgovackiLanci import TrgLanci
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
 from src.schemas.ProdajniObjektDTO import ProdajniObjektDTO, ProdajniObjektOblikEnum
+from src.utils.date_utils import DATE_FORMAT
 
-datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
+datum_cijena = datetime.now().strftime(DATE_FORMAT)
 lanac = TrgLanci.BOSO
 file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
 db = OracleDBConn(lanac.name, run_file=__file__)
@@ -97,8 +96,7 @@ for url in urls:
             broj_pohrane=file_name.split(",")[-3],
         )
 
-        insert_datoteka_into_db(db, dat_dto)
-        pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
+        pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
         if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
             logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
@@ -108,8 +106,7 @@ for url in urls:
 
         for col in lanac.stupci_cijena:
             if col in df.columns:
-                df[col] = df[col].apply(remove_decimals)
-                df[col] = df[col].apply(to_decimal)
+                df[col] = normalize_price_column(df[col])
         df["naziv"] = df["naziv"].apply(clean_naziv)
 
         cijene_dto: List[CijenaDTO] = []
@@ -135,8 +132,12 @@ for url in urls:
                 )
 
                 if cijene.cijena_posebna:
-                    cijene.cijena_posebna_flag = True
-                    cijene.cijena_mpc = cijene.cijena_posebna
+                    cijene = cijene.model_copy(
+                        update={
+                            "cijena_posebna_flag": True,
+                            "cijena_mpc": cijene.cijena_posebna,
+                        }
+                    )
 
                 cijene_dto.append(cijene)
 
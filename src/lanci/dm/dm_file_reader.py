@@ -5,15 +5,14 @@ from pathlib import Path
 from typing import List
 
 import pandas as pd
-from data_utils import remove_decimals, to_decimal
+from data_utils import normalize_price_column
 from db_utils import (
-    get_datoteka_id_and_status,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     update_datoteka_status,
+    upsert_datoteka,
 )
 
 from src.database.db_connection import OracleDBConn
@@ -57,8 +56,7 @@ for file_path in path.iterdir():
                 broj_pohrane=file_name.split("-")[-2],
             )
 
-            insert_datoteka_into_db(db, dat_dto)
-            pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
+            pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
             if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
                 logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
@@ -74,8 +72,7 @@ for file_path in path.iterdir():
                 for col in lanac.stupci_cijena:
                     if col in df.columns:
                         df[col] = df[col].apply(remove_euro_sign)
-                        df[col] = df[col].apply(remove_decimals)
-                        df[col] = df[col].apply(to_decimal)
+                        df[col] = normalize_price_column(df[col])
                 df["marka"] = df["marka"].apply(clean_marka)
 
                 if df is not None:
@@ -99,8 +96,12 @@ for file_path in path.iterdir():
                         )
 
                         if cijene.cijena_posebna:
-                            cijene.cijena_posebna_flag = True
-                            cijene.cijena_mpc = cijene.cijena_posebna
+                            cijene = cijene.model_copy(
+                                update={
+                                    "cijena_posebna_flag": True,
+                                    "cijena_mpc": cijene.cijena_posebna,
+                                }
+                            )
 
                         cijene_dto.append(cijene)
 
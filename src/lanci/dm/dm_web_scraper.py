@@ -4,17 +4,15 @@ from decimal import Decimal
 from typing import List
 
 import pandas as pd
-from data_utils import create_folders, remove_decimals, to_decimal
+from data_utils import create_folders, normalize_price_column
 from db_utils import (
-    get_datoteka_id_and_status,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     update_datoteka_status,
+    upsert_datoteka,
 )
-from environs import env
 
 from src.database.db_connection import OracleDBConn
 from src.lanci.dm.dm_utils import (
@@ -26,8 +24,9 @@ from src.lanci.dm.dm_utils import (
 from src.models.TrgovackiLanci import TrgLanci
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
+from src.utils.date_utils import DATE_FORMAT
 
-datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
+datum_cijena = datetime.now().strftime(DATE_FORMAT)
 lanac = TrgLanci.DM
 
 file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
@@ -63,8 +62,7 @@ try:
         broj_pohrane=file_name.split("-")[-2],
     )
 
-    insert_datoteka_into_db(db, dat_dto)
-    pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
+    pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
     if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
         logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
@@ -76,8 +74,7 @@ try:
         for col in lanac.stupci_cijena:
             if col in df.columns:
                 df[col] = df[col].apply(remove_euro_sign)
-                df[col] = df[col].apply(remove_decimals)
-                df[col] = df[col].apply(to_decimal)
+                df[col] = normalize_price_column(df[col])
         df["marka"] = df["marka"].apply(clean_marka)
 
         cijene_dto: List[CijenaDTO] = []
@@ -103,8 +100,12 @@ try:
                 )
 
                 if cijene.cijena_posebna:
-                    cijene.cijena_posebna_flag = True
-                    cijene.cijena_mpc = cijene.cijena_posebna
+                    cijene = cijene.model_copy(
+                        update={
+                            "cijena_posebna_flag": True,
+                            "cijena_mpc": cijene.cijena_posebna,
+                        }
+                    )
 
                 cijene_dto.append(cijene)
 
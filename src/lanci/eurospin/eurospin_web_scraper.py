@@ -5,21 +5,18 @@ from decimal import Decimal
 from io import BytesIO
 from typing import List
 
-import chardet
 import requests
-from data_utils import create_folders, remove_decimals, to_decimal
+from data_utils import create_folders, normalize_price_column
 from db_utils import (
-    get_datoteka_id_and_status,
     get_id_naselja,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     insert_new_prodajni_objekt,
     update_datoteka_status,
+    upsert_datoteka,
 )
-from environs import env
 
 from src.database.db_connection import OracleDBConn
 from src.lanci.eurospin.eurospin_utils import clean_naziv, get_zip_link
@@ -27,9 +24,10 @@ from src.models.TrgovackiLanci import TrgLanci
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
 from src.schemas.ProdajniObjektDTO import ProdajniObjektDTO, ProdajniObjektOblikEnum
-from src.utils.file_encoding import change_file_encoding
+from src.utils.date_utils import DATE_FORMAT
+from src.utils.file_encoding import change_file_encoding, detect_encoding
 
-datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
+datum_cijena = datetime.now().strftime(DATE_FORMAT)
 lanac = TrgLanci.EUROSPIN
 file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
 create_folders(file_path)
@@ -50,7 +48,7 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
                     logging.info(f"Parsiram daototeku: {file_name}...")
 
                     raw_data = csv_file.read()
-                    detected = chardet.detect(raw_data)
+                    detected = detect_encoding(raw_data)
                     encoding = detected["encoding"] if detected["encoding"] else "utf-8"
 
                     logging.info(
@@ -101,10 +99,7 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
                             datum_objave=datum_cijena,
                         )
 
-                        insert_datoteka_into_db(db, dat_dto)
-                        pmda_id, dat_status = get_datoteka_id_and_status(
-                            db, pmpo_id, datum_cijena
-                        )
+                        pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
                         if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
                             logging.info(
@@ -116,8 +111,7 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
 
                         for col in lanac.stupci_cijena:
                             if col in df.columns:
-                                df[col] = df[col].apply(remove_decimals)
-                                df[col] = df[col].apply(to_decimal)
+                                df[col] = normalize_price_column(df[col])
                         df["NAZIV_PROIZVODA"] = df["NAZIV_PROIZVODA"].apply(clean_naziv)
 
                         cijene_dto: List[CijenaDTO] = []
@@ -145,8 +139,12 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
                                 )
 
                                 if cijene.cijena_posebna:
-                                    cijene.cijena_posebna_flag = True
-                                    cijene.cijena_mpc = cijene.cijena_posebna
+                                    cijene = cijene.model_copy(
+                                        update={
+                                            "cijena_posebna_flag": True,
+                                            "cijena_mpc": cijene.cijena_posebna,
+                                        }
+                                    )
 
                                 cijene_dto.append(cijene)
 
@@ -4,17 +4,16 @@ from decimal import Decimal
 from pathlib import Path
 from typing import List
 
-from data_utils import read_data_file, remove_decimals, to_decimal
+from data_utils import normalize_price_column, read_data_file
 from db_utils import (
-    get_datoteka_id_and_status,
     get_id_naselja,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     insert_new_prodajni_objekt,
     update_datoteka_status,
+    upsert_datoteka,
 )
 
 from src.database.db_connection import OracleDBConn
@@ -77,8 +76,7 @@ for file_path in path.iterdir():
                 datum_objave=datum_cijena,
             )
 
-            insert_datoteka_into_db(db, dat_dto)
-            pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
+            pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
             if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
                 logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
@@ -91,8 +89,7 @@ for file_path in path.iterdir():
             for col in lanac.stupci_cijena:
                 if col in df.columns:
                     df[col] = df[col].apply(remove_strings_in_sidrena_cijena)
-                    df[col] = df[col].apply(remove_decimals)
-                    df[col] = df[col].apply(to_decimal)
+                    df[col] = normalize_price_column(df[col])
 
             if df is not None:
                 logging.info(f"Broj praznih ćelija po stupcu:\n{df.isna().sum()}")
@@ -115,8 +112,12 @@ for file_path in path.iterdir():
                     )
 
                     if cijene.cijena_posebna:
-                        cijene.cijena_posebna_flag = True
-                        cijene.cijena_mpc = cijene.cijena_posebna
+                        cijene = cijene.model_copy(
+                            update={
+                                "cijena_posebna_flag": True,
+                                "cijena_mpc": cijene.cijena_posebna,
+                            }
+                        )
 
                     cijene_dto.append(cijene)
 
@@ -2,19 +2,18 @@ import logging
 import os
 from decimal import Decimal
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
-from data_utils import read_data_file, remove_decimals, to_decimal
+from data_utils import read_data_files_parallel
 from db_utils import (
-    get_datoteka_id_and_status,
     get_id_naselja,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
-    insert_new_prodajni_objekt,
+    insert_prodajni_objekti,
     update_datoteka_status,
+    upsert_datoteka,
 )
 
 from src.database.db_connection import OracleDBConn
@@ -24,47 +23,72 @@ from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
 from src.schemas.ProdajniObjektDTO import ProdajniObjektDTO, ProdajniObjektOblikEnum
 
-datum_cijena = ""
-lanac = TrgLanci.KONZUM
-db = OracleDBConn(lanac.name, run_file=__file__)
-db.connect()
 
-inserted_rows = 0
+def main() -> None:
+    """
+    Čitanje datoteka cijena trgovačkog lanca Konzum sa lokalnog diska i zapisivanje
+    cijena u bazu.
 
-path = Path(rf"C:/Cijene/{datum_cijena}/{lanac.name}")
+    Prvo se jednim batch upitom zapisuju novi prodajni objekti i u bazi se
+    provjerava status svih datoteka, a zatim se paralelno čitaju
+    (read_data_files_parallel, zajedno sa konverzijom cijena u Decimal) samo
+    datoteke čije cijene još nisu spremljene. Zapisivanje u bazu se izvršava u
+    glavnom procesu čim je pojedina datoteka pročitana.
+    """
+    datum_cijena = ""
+    lanac = TrgLanci.KONZUM
+    db = OracleDBConn(lanac.name, run_file=__file__)
+    db.connect()
 
-for file_path in path.iterdir():
-    cijene_dto: List[CijenaDTO] = []
-    datoteke_dto: List[DatotekaDTO] = []
+    inserted_rows = 0
 
-    if file_path.is_file():
+    path = Path(rf"C:/Cijene/{datum_cijena}/{lanac.name}")
+    file_paths = [file_path for file_path in path.iterdir() if file_path.is_file()]
+
+    pmtl_id = get_tl_id(db, lanac)
+    pmpr_id = get_pravilo_id(db, pmtl_id)
+
+    # Prodajni objekti koji ne postoje u bazi se zapisuju jednim batch upitom
+    novi_objekti: Dict[str, ProdajniObjektDTO] = {}
+
+    for file_path in file_paths:
         file_name, ext = os.path.splitext(file_path.name)
+        ducan_id = file_name.split(",")[-4]
+
+        if ducan_id in novi_objekti or get_prodajni_objekt_id(db, pmtl_id, ducan_id):
+            continue
 
         try:
-            logging.info(f"Parsiram datoteku {file_name}...")
-            logging.info(100 * "-")
+            adresa, naselje = extract_address_city(file_name)
+
+            novi_objekti[ducan_id] = ProdajniObjektDTO(
+                pmtl_id=pmtl_id,
+                pmna_id=get_id_naselja(db, naselje),
+                adresa=adresa,
+                oblik=ProdajniObjektOblikEnum.check_value(
+                    file_name.split(",")[0].upper()
+                ).value,
+                oznaka=ducan_id,
+                datum_od=datum_cijena,
+            )
+        except Exception as e:
+            logging.error(f"Dogodila se greška za {file_name}: {e}")
+            raise
+
+    if novi_objekti:
+        insert_prodajni_objekti(db, list(novi_objekti.values()))
+
+    # Zatim se datoteke zapisuju u bazu (status), a čitaju se samo one za koje
+    # cijene još nisu spremljene
+    datoteke: List[Tuple[Path, str, int, int]] = []
 
-            pmtl_id = get_tl_id(db, lanac)
-            pmpr_id = get_pravilo_id(db, pmtl_id)
+    for file_path in file_paths:
+        file_name, ext = os.path.splitext(file_path.name)
+
+        try:
             ducan_id = file_name.split(",")[-4]
             pmpo_id = get_prodajni_objekt_id(db, pmtl_id, ducan_id)
 
-            if not pmpo_id:
-                adresa, naselje = extract_address_city(file_name)
-
-                po_dto = ProdajniObjektDTO(
-                    pmtl_id=pmtl_id,
-                    pmna_id=get_id_naselja(db, naselje),
-                    adresa=adresa,
-                    oblik=ProdajniObjektOblikEnum.check_value(
-                        file_name.split(",")[0].upper()
-                    ).value,
-                    oznaka=ducan_id,
-                    datum_od=datum_cijena,
-                )
-                insert_new_prodajni_objekt(db, po_dto)
-                pmpo_id = get_prodajni_objekt_id(db, pmtl_id, ducan_id)
-
             dat_dto = DatotekaDTO(
                 pmpr_id=pmpr_id,
                 pmpo_id=pmpo_id,
@@ -75,21 +99,29 @@ for file_path in path.iterdir():
                 broj_pohrane=file_name.split(",")[-3],
             )
 
-            insert_datoteka_into_db(db, dat_dto)
-            pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
+            pmda_id, dat_status = upsert_datoteka(db, dat_dto)
+        except Exception as e:
+            logging.error(f"Dogodila se greška za {file_name}: {e}")
+            raise
+
+        if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
+            logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
+            logging.info(100 * "-")
+            logging.info(100 * "-")
+            continue
+
+        datoteke.append((file_path, file_name, pmpo_id, pmda_id))
 
-            if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
-                logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
-                logging.info(100 * "-")
-                logging.info(100 * "-")
-                continue
+    dataframes = read_data_files_parallel(
+        lanac, [file_path for file_path, *_ in datoteke]
+    )
 
-            df = read_data_file(lanac, file_path)
+    for (_file_path, file_name, pmpo_id, pmda_id), df in zip(datoteke, dataframes):
+        cijene_dto: List[CijenaDTO] = []
 
-            for col in lanac.stupci_cijena:
-                if col in df.columns:
-                    df[col] = df[col].apply(remove_decimals)
-                    df[col] = df[col].apply(to_decimal)
+        try:
+            logging.info(f"Parsiram datoteku {file_name}...")
+            logging.info(100 * "-")
 
             if df is not None:
                 logging.info(f"Broj praznih ćelija po stupcu:\n{df.isna().sum()}")
@@ -112,18 +144,30 @@ for file_path in path.iterdir():
                     )
 
                     if cijene.cijena_posebna:
-                        cijene.cijena_posebna_flag = True
-                        cijene.cijena_mpc = cijene.cijena_posebna
+                        cijene = cijene.model_copy(
+                            update={
+                                "cijena_posebna_flag": True,
+                                "cijena_mpc": cijene.cijena_posebna,
+                            }
+                        )
 
                     cijene_dto.append(cijene)
 
             inserted_rows += insert_cijene_into_db(db, cijene_dto)
             update_datoteka_status(db, pmpo_id, file_name, datum_cijena)
+
+            # Podaci datoteke se oslobađaju prije čitanja sljedeće
+            del df, cijene_dto
         except Exception as e:
             logging.error(f"Dogodila se greška za {file_name}: {e}")
             raise
 
-logging.info(100 * "-")
-logging.info(f"Ukupno zapisano redaka: {inserted_rows}")
-db.close()
-db.get_script_execution_time()
+    logging.info(100 * "-")
+    logging.info(f"Ukupno zapisano redaka: {inserted_rows}")
+    db.close()
+    db.get_script_execution_time()
+
+
+# Potrebno zbog ProcessPoolExecutora (spawn na Windowsima ponovno importa skriptu)
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 from environs import env
 
 from src.models.TrgovackiLanci import TrgLanci
+from src.utils.date_utils import DATE_FORMAT
 
 
 def _get_all_pages(datum_cijena: str) -> int:
@@ -25,7 +26,7 @@ def _get_all_pages(datum_cijena: str) -> int:
     """
     logging.info(f"Dohvaćam broj stranica cjenika za datum {datum_cijena}...")
 
-    file_datum_cijena = datetime.strptime(datum_cijena, env("DATE_FORMAT")).strftime(
+    file_datum_cijena = datetime.strptime(datum_cijena, DATE_FORMAT).strftime(
         env("FILE_DATE")
     )
 
@@ -67,7 +68,7 @@ def get_all_files(datum_cijena: str) -> Set[str]:
     """
     logging.info(f"Dohvaćam sve datoteke cjenika za {TrgLanci.KONZUM.name}...")
 
-    file_datum_cijena = datetime.strptime(datum_cijena, env("DATE_FORMAT")).strftime(
+    file_datum_cijena = datetime.strptime(datum_cijena, DATE_FORMAT).strftime(
         env("FILE_DATE")
     )
     files = []
@@ -4,19 +4,17 @@ from decimal import Decimal
 from typing import List
 from urllib.parse import unquote
 
-from data_utils import create_folders, remove_decimals, to_decimal
+from data_utils import create_folders, normalize_price_column
 from db_utils import (
-    get_datoteka_id_and_status,
     get_id_naselja,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     insert_new_prodajni_objekt,
     update_datoteka_status,
+    upsert_datoteka,
 )
-from environs import env
 from web_utils import find_encoding
 
 from src.database.db_connection import OracleDBConn
@@ -25,9 +23,10 @@ from src.models.TrgovackiLanci import TrgLanci
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
 from src.schemas.ProdajniObjektDTO import ProdajniObjektDTO, ProdajniObjektOblikEnum
+from src.utils.date_utils import DATE_FORMAT
 from src.utils.file_encoding import change_file_encoding
 
-datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
+datum_cijena = datetime.now().strftime(DATE_FORMAT)
 lanac = TrgLanci.KTC
 file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
 create_folders(file_path)
@@ -77,8 +76,7 @@ for url in get_all_files(datum_cijena):
                 datum_objave=datum_cijena,
             )
 
-            insert_datoteka_into_db(db, dat_dto)
-            pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
+            pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
             if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
                 logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
@@ -88,8 +86,7 @@ for url in get_all_files(datum_cijena):
 
             for col in lanac.stupci_cijena:
                 if col in df.columns:
-                    df[col] = df[col].apply(remove_decimals)
-                    df[col] = df[col].apply(to_decimal)
+                    df[col] = normalize_price_column(df[col])
 
             cijene_dto: List[CijenaDTO] = []
 
@@ -113,8 +110,12 @@ for url in get_all_files(datum_cijena):
                     )
 
                     if cijene.cijena_posebna:
-                        cijene.cijena_posebna_flag = True
-                        cijene.cijena_mpc = cijene.cijena_posebna
+                        cijene = cijene.model_copy(
+                            update={
+                                "cijena_posebna_flag": True,
+                                "cijena_mpc": cijene.cijena_posebna,
+                            }
+                        )
 
                     cijene_dto.append(cijene)
 
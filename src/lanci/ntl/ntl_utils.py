@@ -4,10 +4,10 @@ from typing import List
 
 import requests
 from bs4 import BeautifulSoup
-from environs import env
 from web_utils import get_data_from_source
 
 from src.models.TrgovackiLanci import TrgLanci
+from src.utils.date_utils import DATE_FORMAT
 
 
 def _get_urls_current_date(datum_cijena: str, text: str) -> List[str]:
@@ -52,7 +52,7 @@ def get_all_files_current_date() -> List[str]:
     Returns:
         List[str]: Lista URL-ova sa datotekama cijena za trenutni datum.
     """
-    datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
+    datum_cijena = datetime.now().strftime(DATE_FORMAT)
 
     return _get_urls_current_date(
         datum_cijena, get_data_from_source(TrgLanci.NTL, datum_cijena)
@@ -5,22 +5,19 @@ from decimal import Decimal
 from io import BytesIO
 from typing import List
 
-import chardet
 import pandas as pd
 import requests
-from data_utils import create_folders, remove_decimals, to_decimal
+from data_utils import create_folders, normalize_price_column
 from db_utils import (
-    get_datoteka_id_and_status,
     get_id_naselja,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     insert_new_prodajni_objekt,
     update_datoteka_status,
+    upsert_datoteka,
 )
-from environs import env
 
 from src.database.db_connection import OracleDBConn
 from src.lanci.plodine.plodine_utils import extract_address_city, get_zip_link
@@ -28,11 +25,13 @@ from src.models.TrgovackiLanci import TrgLanci
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
 from src.schemas.ProdajniObjektDTO import ProdajniObjektDTO, ProdajniObjektOblikEnum
+from src.utils.date_utils import DATE_FORMAT
+from src.utils.file_encoding import detect_encoding
 
 # Potrebno instalirati pip-system-certs inače baca grešku za SSL
 # [SSL: CERTIFICATE_VERIFY_FAILED] certificate verify failed: unable to get local issuer certificate (_ssl.c:1000)')
 
-datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
+datum_cijena = datetime.now().strftime(DATE_FORMAT)
 lanac = TrgLanci.PLODINE
 file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
 create_folders(file_path)
@@ -55,7 +54,7 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
                     file_name_no_ext = file_name[:-4]  # Briše .csv iz naziva datoteke
 
                     raw_data = csv_file.read()
-                    detected = chardet.detect(raw_data)
+                    detected = detect_encoding(raw_data)
                     encoding = detected["encoding"] if detected["encoding"] else "utf-8"
 
                     logging.info(
@@ -113,10 +112,7 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
                         broj_pohrane=file_name.split("_")[-2],
                     )
 
-                    insert_datoteka_into_db(db, dat_dto)
-                    pmda_id, dat_status = get_datoteka_id_and_status(
-                        db, pmpo_id, datum_cijena
-                    )
+                    pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
                     if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
                         logging.info(
@@ -128,8 +124,7 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
 
                     for col in lanac.stupci_cijena:
                         if col in df.columns:
-                            df[col] = df[col].apply(remove_decimals)
-                            df[col] = df[col].apply(to_decimal)
+                            df[col] = normalize_price_column(df[col])
 
                     cijene_dto: List[CijenaDTO] = []
 
@@ -156,8 +151,12 @@ with zipfile.ZipFile(zip_data, "r") as zip_file:
                             )
 
                             if cijene.cijena_posebna:
-                                cijene.cijena_posebna_flag = True
-                                cijene.cijena_mpc = cijene.cijena_posebna
+                                cijene = cijene.model_copy(
+                                    update={
+                                        "cijena_posebna_flag": True,
+                                        "cijena_mpc": cijene.cijena_posebna,
+                                    }
+                                )
 
                             cijene_dto.append(cijene)
 
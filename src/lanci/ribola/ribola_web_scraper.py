@@ -6,19 +6,17 @@ from typing import List
 
 import pandas as pd
 import requests
-from data_utils import create_folders, remove_decimals, to_decimal
+from data_utils import create_folders, normalize_price_column
 from db_utils import (
-    get_datoteka_id_and_status,
     get_id_naselja,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     insert_new_prodajni_objekt,
     update_datoteka_status,
+    upsert_datoteka,
 )
-from environs import env
 from lxml import etree
 
 from src.database.db_connection import OracleDBConn
@@ -27,8 +25,9 @@ from src.models.TrgovackiLanci import TrgLanci
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
 from src.schemas.ProdajniObjektDTO import ProdajniObjektDTO, ProdajniObjektOblikEnum
+from src.utils.date_utils import DATE_FORMAT
 
-datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
+datum_cijena = datetime.now().strftime(DATE_FORMAT)
 lanac = TrgLanci.RIBOLA
 file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
 create_folders(file_path)
@@ -88,8 +87,7 @@ for url in get_all_files(datum_cijena):
 
         for col in lanac.stupci_cijena:
             if col in df.columns:
-                df[col] = df[col].apply(remove_decimals)
-                df[col] = df[col].apply(to_decimal)
+                df[col] = normalize_price_column(df[col])
 
         pmtl_id = get_tl_id(db, lanac)
         pmpr_id = get_pravilo_id(db, pmtl_id)
@@ -121,8 +119,7 @@ for url in get_all_files(datum_cijena):
             broj_pohrane=file_name.split("-")[-8],
         )
 
-        insert_datoteka_into_db(db, dat_dto)
-        pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
+        pmda_id, dat_status = upsert_datoteka(db, dat_dto)
 
         if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
             logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
@@ -153,8 +150,12 @@ for url in get_all_files(datum_cijena):
                 )
 
                 if cijene.cijena_posebna:
-                    cijene.cijena_posebna_flag = True
-                    cijene.cijena_mpc = cijene.cijena_posebna
+                    cijene = cijene.model_copy(
+                        update={
+                            "cijena_posebna_flag": True,
+                            "cijena_mpc": cijene.cijena_posebna,
+                        }
+                    )
 
                 cijene_dto.append(cijene)
 
@@ -1,11 +1,24 @@
 import logging
-from typing import List
+from typing import Any, Dict, List
 
+import pandas as pd
 from bs4 import BeautifulSoup
+from data_utils import price_to_decimal
+from lxml import etree
 from web_utils import get_data_from_source
 
 from src.models.TrgovackiLanci import TrgLanci
 
+# Jedan parser po procesu; whitespace između tagova, xml:id indeks i entiteti
+# nisu potrebni za Vrutak cjenike pa se isključuju
+_XML_PARSER = etree.XMLParser(
+    recover=True,
+    remove_blank_text=True,
+    collect_ids=False,
+    resolve_entities=False,
+    huge_tree=True,
+)
+
 
 def get_all_files(datum_cijena: str) -> List[str]:
     """
@@ -45,3 +58,123 @@ def get_all_files(datum_cijena: str) -> List[str]:
     logging.info(f"Dohvaćeno {len(urls)} datoteka cjenika.")
 
     return urls
+
+
+def parse_file(content: bytes, oblik: str) -> List[Dict[str, Any]]:
+    """
+    Parsiranje XML datoteke cijena trgovačkog lanca Vrutak u listu dictionarya sa
+    poljima za CijenaDTO (bez pmda_id i datum koji se dodaju prilikom zapisivanja).
+
+    Funkcija je na razini modula i vraća obične dictionarye kako bi se mogla
+    izvršavati u ProcessPoolExecutor workerima.
+
+    Args:
+        content (bytes): Sadržaj XML datoteke.
+        oblik (str): Oblik prodajnog objekta iz naziva datoteke (supermarket/hipermarket).
+
+    Returns:
+        List[Dict[str, Any]]: Lista dictionarya sa podacima o cijenama.
+    """
+    root = etree.fromstring(content, parser=_XML_PARSER)
+
+    products_data = []
+
+    for item in root.findall("item"):
+        if oblik == "supermarket":
+            product_data = {
+                "naziv": item.find("naziv").text,
+                "sifra": item.find("sifra").text,
+                "marka": item.find("marka").text,
+                "nettokolicina": item.find("nettokolicina").text,
+                "mjera": item.find("mjera").text,
+                "mpcijena": item.find("mpcijena").text,
+                "mpcijenamjera": item.find("mpcijenamjera").text,
+                "barkod": item.find("barkod").text,
+                "kategorija": item.find("kategorija").text,
+            }
+
+            products_data.append(product_data)
+
+        if oblik == "hipermarket":
+            product_data = {
+                "naziv": item.find("naziv").text,
+                "sifra": item.find("sifra").text,
+                "marka": item.find("marka").text,
+                "nettokolicina": item.find("nettokolicina").text,
+                "mjera": item.find("mjera").text,
+                "mpcijena": item.find("mpcijena").text,
+                "mpcijenamjera": item.find("mpcijenamjera").text,
+                "mpcijenasidrena": item.find("mpcijenasidrena").text,
+                "mpcijenasidrenadatum": item.find("mpcijenasidrenadatum").text,
+                "barkod": item.find("barkod").text,
+                "kategorija": item.find("kategorija").text,
+            }
+
+            products_data.append(product_data)
+
+    df = pd.DataFrame(products_data)
+
+    metro_cijene = ["mpcijena", "mpcijenamjera"]
+
+    if oblik == "hipermarket":
+        metro_cijene.append("mpcijenasidrena")
+
+    for col in metro_cijene:
+        if col in df.columns:
+            df[col] = df[col].map(price_to_decimal)
+
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Broj praznih ćelija po stupcu:\n%s", df.isna().sum())
+
+    cijene: List[Dict[str, Any]] = []
+
+    # Stupci cijena su već Decimal (price_to_decimal) pa se ne konvertiraju ponovno
+    for row in df.itertuples(index=False, name=None):
+        if oblik == "supermarket":
+            cijene.append(
+                {
+                    "naziv_proizv": str(row[0]),
+                    "sifra_proizv": str(row[1]),
+                    "marka_proizv": str(row[2]),
+                    "neto_kolicina": str(row[3]),
+                    "jedinica_mjere": str(row[4]),
+                    "cijena_mpc": row[5],
+                    "cijena_jed_mjere": row[6],
+                    "barkod": str(row[7]),
+                    "kategorija": str(row[8]),
+                }
+            )
+
+        if oblik == "hipermarket":
+            cijene.append(
+                {
+                    "naziv_proizv": str(row[0]),
+                    "sifra_proizv": str(row[1]),
+                    "marka_proizv": str(row[2]),
+                    "neto_kolicina": str(row[3]),
+                    "jedinica_mjere": str(row[4]),
+                    "cijena_mpc": row[5],
+                    "cijena_jed_mjere": row[6],
+                    "cijena_sidrena": row[7],
+                    "barkod": str(row[9]),
+                    "kategorija": str(row[10]),
+                }
+            )
+
+    return cijene
+
+
+def parse_local_file(file_path: str, oblik: str) -> List[Dict[str, Any]]:
+    """
+    Parsiranje XML datoteke cijena spremljene na lokalni disk (pogledati parse_file).
+    Worker sam čita datoteku pa se sadržaj ne šalje iz glavnog procesa.
+
+    Args:
+        file_path (str): Putanja XML datoteke sa lokalnog diska.
+        oblik (str): Oblik prodajnog objekta iz naziva datoteke (supermarket/hipermarket).
+
+    Returns:
+        List[Dict[str, Any]]: Lista dictionarya sa podacima o cijenama.
+    """
+    with open(file_path, "rb") as file:
+        return parse_file(file.read(), oblik)
@@ -1,183 +1,136 @@
 import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
-from decimal import Decimal
-from typing import List
+from typing import List, Tuple
 from urllib.parse import unquote
 
-import pandas as pd
 import requests
-from data_utils import create_folders, remove_decimals, to_decimal
+from data_utils import create_folders
 from db_utils import (
-    get_datoteka_id_and_status,
     get_pravilo_id,
     get_prodajni_objekt_id,
     get_tl_id,
     insert_cijene_into_db,
-    insert_datoteka_into_db,
     update_datoteka_status,
+    upsert_datoteka,
 )
-from environs import env
-from lxml import etree
 
 from src.database.db_connection import OracleDBConn
-from src.lanci.vrutak.vrutak_utils import get_all_files
+from src.lanci.vrutak.vrutak_utils import get_all_files, parse_local_file
 from src.models.TrgovackiLanci import TrgLanci
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO, StatusEnum
-
-datum_cijena = datetime.now().strftime(env("DATE_FORMAT"))
-lanac = TrgLanci.VRUTAK
-file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
-create_folders(file_path)
-db = OracleDBConn(lanac.name, run_file=__file__)
-db.connect()
-
-inserted_rows = 0
-
-for url in get_all_files(datum_cijena):
-    file_name = unquote(url.split("/")[-1])
-    file_name_no_ext = file_name[:-4]  # Briše .xml iz naziva datoteke
-
-    logging.info(f"Dohvaćam i parsiram datoteku {file_name}...")
-
-    ducan_id = file_name.split("-")[3]
-
-    try:
-        response = requests.get(url)
-
-        with open(rf"{file_path}\{file_name}", "wb") as file:
-            file.write(response.content)
-
-        parser = etree.XMLParser(recover=True)
-        root = etree.fromstring(response.content, parser=parser)
-
-        oblik = file_name.split("-")[1]
-
-        products_data = []
-
-        for item in root.findall("item"):
-            if oblik == "supermarket":
-                product_data = {
-                    "naziv": item.find("naziv").text,
-                    "sifra": item.find("sifra").text,
-                    "marka": item.find("marka").text,
-                    "nettokolicina": item.find("nettokolicina").text,
-                    "mjera": item.find("mjera").text,
-                    "mpcijena": item.find("mpcijena").text,
-                    "mpcijenamjera": item.find("mpcijenamjera").text,
-                    "barkod": item.find("barkod").text,
-                    "kategorija": item.find("kategorija").text,
-                }
-
-                products_data.append(product_data)
-
-            if oblik == "hipermarket":
-                product_data = {
-                    "naziv": item.find("naziv").text,
-                    "sifra": item.find("sifra").text,
-                    "marka": item.find("marka").text,
-                    "nettokolicina": item.find("nettokolicina").text,
-                    "mjera": item.find("mjera").text,
-                    "mpcijena": item.find("mpcijena").text,
-                    "mpcijenamjera": item.find("mpcijenamjera").text,
-                    "mpcijenasidrena": item.find("mpcijenasidrena").text,
-                    "mpcijenasidrenadatum": item.find("mpcijenasidrenadatum").text,
-                    "barkod": item.find("barkod").text,
-                    "kategorija": item.find("kategorija").text,
-                }
-
-                products_data.append(product_data)
-
-        df = pd.DataFrame(products_data)
-
-        metro_cijene = ["mpcijena", "mpcijenamjera"]
-
-        if oblik == "hipermarket":
-            metro_cijene.append("mpcijenasidrena")
-
-        for col in metro_cijene:
-            if col in df.columns:
-                df[col] = df[col].apply(remove_decimals)
-                df[col] = df[col].apply(to_decimal)
-
-        pmtl_id = get_tl_id(db, lanac)
-        pmpr_id = get_pravilo_id(db, pmtl_id)
-        pmpo_id = get_prodajni_objekt_id(db, pmtl_id, ducan_id)
-
-        dat_dto = DatotekaDTO(
-            pmpr_id=pmpr_id,
-            pmpo_id=pmpo_id,
-            dat_naziv=file_name_no_ext,
-            dat_format=lanac.file_ext,
-            status=StatusEnum.INIT,
-            datum_objave=datum_cijena,
-            broj_pohrane=file_name.split("-")[-3],
-        )
-
-        insert_datoteka_into_db(db, dat_dto)
-        pmda_id, dat_status = get_datoteka_id_and_status(db, pmpo_id, datum_cijena)
-
-        if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
-            logging.info(f"U bazi već postoje cijene za datoteku ID: {pmda_id}")
-            logging.info(100 * "-")
-            logging.info(100 * "-")
-            continue
-
-        cijene_dto: List[CijenaDTO] = []
-
-        if df is not None:
-            logging.info(f"Broj praznih ćelija po stupcu:\n{df.isna().sum()}")
-            for _index, row in df.iterrows():
-                if oblik == "supermarket":
-                    cijene = CijenaDTO(
-                        pmda_id=pmda_id,
-                        naziv_proizv=str(row.iloc[0]),
-                        sifra_proizv=str(row.iloc[1]),
-                        marka_proizv=str(row.iloc[2]),
-                        neto_kolicina=str(row.iloc[3]),
-                        jedinica_mjere=str(row.iloc[4]),
-                        cijena_mpc=Decimal(row.iloc[5]),
-                        cijena_jed_mjere=Decimal(row.iloc[6]),
-                        barkod=str(row.iloc[7]),
-                        kategorija=str(row.iloc[8]),
-                        datum=datum_cijena,
+from src.utils.date_utils import DATE_FORMAT
+
+
+def main() -> None:
+    """
+    Preuzimanje datoteka cijena trgovačkog lanca Vrutak i zapisivanje cijena u bazu.
+
+    Datoteke se preuzimaju redom i svaka se odmah nakon spremanja na disk parsira
+    u ProcessPoolExecutor workeru, a zapisivanje u bazu se izvršava u glavnom
+    procesu.
+    """
+    datum_cijena = datetime.now().strftime(DATE_FORMAT)
+    lanac = TrgLanci.VRUTAK
+    file_path = rf"C:\Cijene\{datum_cijena}\{lanac.name}"
+    create_folders(file_path)
+    db = OracleDBConn(lanac.name, run_file=__file__)
+    db.connect()
+
+    inserted_rows = 0
+    # Lokalne reference se dohvaćaju brže od atributa modula unutar petlje
+    log_info = logging.info
+    log_error = logging.error
+    datoteke: List[Tuple[str, List[str], Future]] = []
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for url in get_all_files(datum_cijena):
+            file_name = unquote(url.split("/")[-1])
+            # Naziv bez .xml se dijeli samo jednom (oblik, šifra dućana, broj pohrane)
+            split_file_name = file_name[:-4].split("-")
+            local_file = rf"{file_path}\{file_name}"
+
+            log_info("Dohvaćam datoteku %s...", file_name)
+
+            try:
+                response = requests.get(url)
+
+                with open(local_file, "wb") as file:
+                    file.write(response.content)
+            except Exception as e:
+                log_error("Dogodila se greška za %s: %s", file_name, e)
+                raise
+
+            # Datoteka se parsira čim je spremljena (worker je čita sa diska), dok se
+            # preuzimaju ostale, a sadržaj se ne drži u memoriji glavnog procesa
+            future = executor.submit(parse_local_file, local_file, split_file_name[1])
+            datoteke.append((file_name, split_file_name, future))
+
+        for file_name, split_file_name, future in datoteke:
+            file_name_no_ext = file_name[:-4]  # Briše .xml iz naziva datoteke
+
+            log_info("Parsiram datoteku %s...", file_name)
+
+            ducan_id = split_file_name[3]
+
+            try:
+                proizvodi = future.result()
+
+                pmtl_id = get_tl_id(db, lanac)
+                pmpr_id = get_pravilo_id(db, pmtl_id)
+                pmpo_id = get_prodajni_objekt_id(db, pmtl_id, ducan_id)
+
+                dat_dto = DatotekaDTO(
+                    pmpr_id=pmpr_id,
+                    pmpo_id=pmpo_id,
+                    dat_naziv=file_name_no_ext,
+                    dat_format=lanac.file_ext,
+                    status=StatusEnum.INIT,
+                    datum_objave=datum_cijena,
+                    broj_pohrane=split_file_name[-3],
+                )
+
+                pmda_id, dat_status = upsert_datoteka(db, dat_dto)
+
+                if dat_status == StatusEnum.SPREMLJENO_U_BAZI.value:
+                    log_info("U bazi već postoje cijene za datoteku ID: %s", pmda_id)
+                    log_info(100 * "-")
+                    log_info(100 * "-")
+                    continue
+
+                cijene_dto = [
+                    (
+                        cijene.model_copy(
+                            update={
+                                "cijena_posebna_flag": True,
+                                "cijena_mpc": cijene.cijena_posebna,
+                            }
+                        )
+                        if cijene.cijena_posebna
+                        else cijene
                     )
-
-                    if cijene.cijena_posebna:
-                        cijene.cijena_posebna_flag = True
-                        cijene.cijena_mpc = cijene.cijena_posebna
-
-                    cijene_dto.append(cijene)
-
-                if oblik == "hipermarket":
-                    cijene = CijenaDTO(
-                        pmda_id=pmda_id,
-                        naziv_proizv=str(row.iloc[0]),
-                        sifra_proizv=str(row.iloc[1]),
-                        marka_proizv=str(row.iloc[2]),
-                        neto_kolicina=str(row.iloc[3]),
-                        jedinica_mjere=str(row.iloc[4]),
-                        cijena_mpc=Decimal(row.iloc[5]),
-                        cijena_jed_mjere=Decimal(row.iloc[6]),
-                        cijena_sidrena=Decimal(row.iloc[7]),
-                        barkod=str(row.iloc[9]),
-                        kategorija=str(row.iloc[10]),
-                        datum=datum_cijena,
+                    for cijene in CijenaDTO.build_batch(
+                        [
+                            {"pmda_id": pmda_id, "datum": datum_cijena, **proizvod}
+                            for proizvod in proizvodi
+                        ]
                     )
+                ]
 
-                    if cijene.cijena_posebna:
-                        cijene.cijena_posebna_flag = True
-                        cijene.cijena_mpc = cijene.cijena_posebna
+                inserted_rows += insert_cijene_into_db(db, cijene_dto)
+                update_datoteka_status(db, pmpo_id, file_name_no_ext, datum_cijena)
+            except Exception as e:
+                log_error("Dogodila se greška za %s: %s", file_name, e)
+                raise
 
-                    cijene_dto.append(cijene)
+    logging.info(100 * "-")
+    logging.info("Ukupno zapisano redaka: %s", inserted_rows)
+    db.close()
+    db.get_script_execution_time()
 
-        inserted_rows += insert_cijene_into_db(db, cijene_dto)
-        update_datoteka_status(db, pmpo_id, file_name_no_ext, datum_cijena)
-    except Exception as e:
-        logging.error(f"Dogodila se greška za {file_name}: {e}")
-        raise
 
-logging.info(100 * "-")
-logging.info(f"Ukupno zapisano redaka: {inserted_rows}")
-db.close()
-db.get_script_execution_time()
+# Potrebno zbog ProcessPoolExecutora (spawn na Windowsima ponovno importa skriptu)
+if __name__ == "__main__":
+    main()
@@ -1,276 +1,363 @@
-from enum import Enum
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, Tuple
 
 from src.schemas.DatotekaDTO import DatotekaFormatEnum
 
 
-class TrgLanci(Enum):
+@dataclass(frozen=True, eq=False)
+class TrgLanacInfo:
     """
-    Enum sa listom trgovačkih lanaca sa pripadajućim URL-ovima i separatorima (lanci koji dostavljaju .csv datoteke).
+    Podaci o pojedinom trgovačkom lancu sa pripadajućim URL-ovima i separatorima.
+
+    Statička konfiguracija pa je objekt frozen i koristi __slots__ (brži dohvat
+    atributa od Enum membera). Usporedba (==) i hash su po identitetu objekta.
+
+    Attributes:
+        name (str): Naziv trgovačkog lanca.
+        display_name (str): Naziv trgovačkog lanca u bazi podataka (npr. ŽABAC).
+        base_url (str): Glavna stranica trgovačkog lanca.
+        cijene_url (str): Stranica cijena trgovačkog lanca (kod nekih je u json obliku).
+        file_ext (DatotekaFormatEnum): Ekstenzija datoteka cijena.
+        stupci_cijena (Tuple[str, ...]): Stupci/tagovi cijena u datotekama cijena.
+        separator (str): Separator csv datoteka.
     """
 
-    BOSO = (
-        "https://www.boso.hr",
-        "https://www.boso.hr/cjenik",
-        DatotekaFormatEnum.CSV,
-        [
+    __slots__ = (
+        "name",
+        "display_name",
+        "base_url",
+        "cijene_url",
+        "file_ext",
+        "stupci_cijena",
+        "separator",
+    )
+
+    name: str
+    display_name: str
+    base_url: str
+    cijene_url: str
+    file_ext: DatotekaFormatEnum
+    stupci_cijena: Tuple[str, ...]
+    separator: str
+
+    def __reduce__(self) -> Tuple[object, Tuple[str]]:
+        """
+        Pickle vraća isti objekt iz TRG_LANCI (npr. u worker procesima) pa
+        usporedba po identitetu ostaje valjana.
+        """
+        return _get_trg_lanac, (self.name,)
+
+    def __str__(self) -> str:
+        """
+        Naziv trgovačkog lanca kao string.
+        """
+        return self.name
+
+    def __repr__(self) -> str:
+        """
+        Detaljan prikaz za debugging.
+        """
+        return (
+            f"TrgLanci.{self.name}: base={self.base_url}, cijene={self.cijene_url}, file_ext={self.file_ext}, "
+            f"separator={self.separator}"
+        )
+
+
+TRG_LANCI: Dict[str, TrgLanacInfo] = {
+    "BOSO": TrgLanacInfo(
+        name="BOSO",
+        display_name="BOSO",
+        base_url="https://www.boso.hr",
+        cijene_url="https://www.boso.hr/cjenik",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "MPC",
             "cijena za jedinicu mjere",
             "MPC za vrijeme posebnog oblika prodaje",
             "Najniža cijena u poslj. 30 dana",
             "sidrena cijena na 2.5.2025",
-        ],
-        ";",
-    )
-
-    DM = (
-        "https://www.dm.hr",
-        "https://content.services.dmtech.com/rootpage-dm-shop-hr-hr/novo/promocije/nove-oznake-cijena-i-vazeci-cjenik-u-dm-u-2906632",
-        DatotekaFormatEnum.XLSX,
-        [
+        ),
+        separator=";",
+    ),
+    "DM": TrgLanacInfo(
+        name="DM",
+        display_name="DM",
+        base_url="https://www.dm.hr",
+        cijene_url="https://content.services.dmtech.com/rootpage-dm-shop-hr-hr/novo/promocije/nove-oznake-cijena-i-vazeci-cjenik-u-dm-u-2906632",
+        file_ext=DatotekaFormatEnum.XLSX,
+        stupci_cijena=(
             "MPC",
             "cijena za jedinicu mjere",
             "MPC za vrijeme posebnog oblika prodaje (Rasprodaja proizvoda koji izlaze iz asortimana)",
             "Najniža cijena u posljednjih 30 dana prije rasprodaje",
             "sidrena cijena na 2.5.2025. ili na datum ulistanja",
-        ],
-        "",
-    )
-
-    EUROSPIN = (
-        "https://www.eurospin.hr",
-        "https://www.eurospin.hr/cjenik",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator="",
+    ),
+    "EUROSPIN": TrgLanacInfo(
+        name="EUROSPIN",
+        display_name="EUROSPIN",
+        base_url="https://www.eurospin.hr",
+        cijene_url="https://www.eurospin.hr/cjenik",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "MALOPROD.CIJENA(EUR)",
             "CIJENA_ZA_JEDINICU_MJERE",
             "MPC_POSEB.OBLIK_PROD",
             "NAJNIŽA_MPC_U_30DANA",
             "SIDRENA_CIJENA",
-        ],
-        ";",
-    )
-
-    KAUFLAND = (
-        "https://www.kaufland.hr",
-        "https://www.kaufland.hr/akcije-novosti/popis-mpc.assetSearch.id=assetList_1599847924.json",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator=";",
+    ),
+    "KAUFLAND": TrgLanacInfo(
+        name="KAUFLAND",
+        display_name="KAUFLAND",
+        base_url="https://www.kaufland.hr",
+        cijene_url="https://www.kaufland.hr/akcije-novosti/popis-mpc.assetSearch.id=assetList_1599847924.json",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "maloprod.cijena(EUR)",
             "cijena jed.mj.(EUR)",
             "MPC poseb.oblik prod",
             "Najniža MPC u 30dana",
             "Sidrena cijena",
-        ],
-        "\t",
-    )
-
-    KONZUM = (
-        "https://www.konzum.hr",
-        "https://www.konzum.hr/cjenici",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator="\t",
+    ),
+    "KONZUM": TrgLanacInfo(
+        name="KONZUM",
+        display_name="KONZUM",
+        base_url="https://www.konzum.hr",
+        cijene_url="https://www.konzum.hr/cjenici",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "MALOPRODAJNA CIJENA",
             "CIJENA ZA JEDINICU MJERE",
             "MPC ZA VRIJEME POSEBNOG OBLIKA PRODAJE",
             "NAJNIŽA CIJENA U POSLJEDNIH 30 DANA",
             "SIDRENA CIJENA NA 2.5.2025",
-        ],
-        ",",
-    )
-
-    KTC = (
-        "https://www.ktc.hr",
-        "https://www.ktc.hr/cjenici",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator=",",
+    ),
+    "KTC": TrgLanacInfo(
+        name="KTC",
+        display_name="KTC",
+        base_url="https://www.ktc.hr",
+        cijene_url="https://www.ktc.hr/cjenici",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "Maloprodajna cijena",
             "Cijena za jedinicu mjere",
             "Najniža cijena u posljednjih 30 dana",
             "MPC za vrijeme posebnog oblika prodaje",
-        ],
-        ";",
-    )
-
-    LIDL = (
-        "https://tvrtka.lidl.hr",
-        "https://tvrtka.lidl.hr/cijene",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator=";",
+    ),
+    "LIDL": TrgLanacInfo(
+        name="LIDL",
+        display_name="LIDL",
+        base_url="https://tvrtka.lidl.hr",
+        cijene_url="https://tvrtka.lidl.hr/cijene",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "MALOPRODAJNA_CIJENA",
             "CIJENA_ZA_JEDINICU_MJERE",
             "MPC_ZA_VRIJEME_POSEBNOG_OBLIKA_PRODAJE",
             "NAJNIZA_CIJENA_U_POSLJ._30_DANA",
             "Sidrena_cijena_na_02.05.2025",
-        ],
-        ",",
-    )
-
-    METRO = (
-        "https://www.metro-cc.hr",
-        "https://metrocjenik.com.hr",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator=",",
+    ),
+    "METRO": TrgLanacInfo(
+        name="METRO",
+        display_name="METRO",
+        base_url="https://www.metro-cc.hr",
+        cijene_url="https://metrocjenik.com.hr",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "MPS",
             "CIJENA_PO_MJERI",
             "POSEBNA_PRODAJA",
             "NAJNIZA_30_DANA",
             "SIDRENA_02_05",
-        ],
-        ",",
-    )
-
-    NTL = (
-        "https://ntl.hr",
-        "https://ntl.hr/cjenik",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator=",",
+    ),
+    "NTL": TrgLanacInfo(
+        name="NTL",
+        display_name="NTL",
+        base_url="https://ntl.hr",
+        cijene_url="https://ntl.hr/cjenik",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "Maloprodajna cijena",
             "Cijena za jedinicu mjere",
             "MPC za vrijeme posebnog oblika prodaje",
             "Najniža cijena u poslj.30 dana",
             "Sidrena cijena na 2.5.2025",
-        ],
-        ";",
-    )
-
-    PLODINE = (
-        "https://www.plodine.hr",
-        "https://www.plodine.hr/info-o-cijenama",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator=";",
+    ),
+    "PLODINE": TrgLanacInfo(
+        name="PLODINE",
+        display_name="PLODINE",
+        base_url="https://www.plodine.hr",
+        cijene_url="https://www.plodine.hr/info-o-cijenama",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "Maloprodajna cijena",
             "Cijena po JM",
             "MPC za vrijeme posebnog oblika prodaje",
             "Najniza cijena u poslj. 30 dana",
             "Sidrena cijena na 2.5.2025",
-        ],
-        ";",
-    )
-
-    RIBOLA = (
-        "https://ribola.hr",
-        "https://ribola.hr/ribola-cjenici",
-        DatotekaFormatEnum.XML,
-        [
+        ),
+        separator=";",
+    ),
+    "RIBOLA": TrgLanacInfo(
+        name="RIBOLA",
+        display_name="RIBOLA",
+        base_url="https://ribola.hr",
+        cijene_url="https://ribola.hr/ribola-cjenici",
+        file_ext=DatotekaFormatEnum.XML,
+        stupci_cijena=(
             "MaloprodajnaCijena",
             "CijenaPoJedinici",
             "MaloprodajnaCijenaAkcija",
             "NajnizaCijena",
             "SidrenaCijena",
-        ],
-        "",
-    )
-
-    SPAR = (
-        "https://www.spar.hr",
-        "https://www.spar.hr/usluge/cjenici",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator="",
+    ),
+    "SPAR": TrgLanacInfo(
+        name="SPAR",
+        display_name="SPAR",
+        base_url="https://www.spar.hr",
+        cijene_url="https://www.spar.hr/usluge/cjenici",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "MPC (EUR)",
             "cijena za jedinicu mjere (EUR)",
             "MPC za vrijeme posebnog oblika prodaje (EUR)",
             "Najniža cijena u posljednjih 30 dana (EUR)",
             "sidrena cijena na 2.5.2025. (EUR)",
-        ],
-        ";",
-    )
-
-    STUDENAC = (
-        "https://www.studenac.hr",
-        "https://www.studenac.hr/popis-maloprodajnih-cijena",
-        DatotekaFormatEnum.XML,
-        [
+        ),
+        separator=";",
+    ),
+    "STUDENAC": TrgLanacInfo(
+        name="STUDENAC",
+        display_name="STUDENAC",
+        base_url="https://www.studenac.hr",
+        cijene_url="https://www.studenac.hr/popis-maloprodajnih-cijena",
+        file_ext=DatotekaFormatEnum.XML,
+        stupci_cijena=(
             "MaloprodajnaCijena",
             "CijenaPoJedinici",
             "MaloprodajnaCijenaAkcija",
             "NajnizaCijena",
             "SidrenaCijena",
-        ],
-        "",
-    )
-
-    TOMMY = (
-        "https://www.tommy.hr",
-        "https://www.tommy.hr/objava-cjenika",
-        DatotekaFormatEnum.CSV,
-        ["MPC", "MPC_POSEBNA_PRODAJA", "CIJENA_PO_JM", "MPC_NAJNIZA_30", "MPC_020525"],
-        ",",
-    )
-
-    TRGOCENTAR = (
-        "https://trgocentar.com",
-        "https://trgocentar.com/Trgovine-cjenik",
-        DatotekaFormatEnum.XML,
-        ["mpc", "c_jmj", "mpc_pop", "c_najniza_30", "c_020525"],
-        "",
-    )
-
-    TRGOVINA_KRK = (
-        "https://trgovina-krk.hr",
-        "https://trgovina-krk.hr/objava-cjenika",
-        DatotekaFormatEnum.CSV,
-        [
+        ),
+        separator="",
+    ),
+    "TOMMY": TrgLanacInfo(
+        name="TOMMY",
+        display_name="TOMMY",
+        base_url="https://www.tommy.hr",
+        cijene_url="https://www.tommy.hr/objava-cjenika",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
+            "MPC",
+            "MPC_POSEBNA_PRODAJA",
+            "CIJENA_PO_JM",
+            "MPC_NAJNIZA_30",
+            "MPC_020525",
+        ),
+        separator=",",
+    ),
+    "TRGOCENTAR": TrgLanacInfo(
+        name="TRGOCENTAR",
+        display_name="TRGOCENTAR",
+        base_url="https://trgocentar.com",
+        cijene_url="https://trgocentar.com/Trgovine-cjenik",
+        file_ext=DatotekaFormatEnum.XML,
+        stupci_cijena=("mpc", "c_jmj", "mpc_pop", "c_najniza_30", "c_020525"),
+        separator="",
+    ),
+    "TRGOVINA_KRK": TrgLanacInfo(
+        name="TRGOVINA_KRK",
+        display_name="TRGOVINA KRK",
+        base_url="https://trgovina-krk.hr",
+        cijene_url="https://trgovina-krk.hr/objava-cjenika",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
             "Maloprodajna cijena",
             "Cijena za jedinicu mjere",
             "MPC za vrijeme posebnog oblika prodaje",
             "Najniža cijena u poslj.30 dana",
             "Sidrena cijena na 2.5.2025",
-        ],
-        ";",
-    )
+        ),
+        separator=";",
+    ),
+    "VRUTAK": TrgLanacInfo(
+        name="VRUTAK",
+        display_name="VRUTAK",
+        base_url="https://www.vrutak.hr",
+        cijene_url="https://www.vrutak.hr/cjenik-svih-artikala",
+        file_ext=DatotekaFormatEnum.XML,
+        stupci_cijena=(),
+        separator="",
+    ),
+    "ZABAC": TrgLanacInfo(
+        name="ZABAC",
+        display_name="ŽABAC",
+        base_url="https://zabacfoodoutlet.hr",
+        cijene_url="https://zabacfoodoutlet.hr/cjenik",
+        file_ext=DatotekaFormatEnum.CSV,
+        stupci_cijena=(
+            "Mpc",
+            "Najniža cijena u posljednjih 30 dana",
+            "Sidrena cijena na 2.5.2025",
+        ),
+        separator=",",
+    ),
+}
 
-    VRUTAK = (
-        "https://www.vrutak.hr",
-        "https://www.vrutak.hr/cjenik-svih-artikala",
-        DatotekaFormatEnum.XML,
-        [],
-        "",
-    )
 
-    ZABAC = (
-        "https://zabacfoodoutlet.hr",
-        "https://zabacfoodoutlet.hr/cjenik",
-        DatotekaFormatEnum.CSV,
-        ["Mpc", "Najniža cijena u posljednjih 30 dana", "Sidrena cijena na 2.5.2025"],
-        ",",
-    )
+def _get_trg_lanac(name: str) -> TrgLanacInfo:
+    """
+    Dohvaćanje podataka o trgovačkom lancu prema nazivu (koristi se kod unpicklanja).
 
-    def __init__(
-        self,
-        base_url: str,
-        cijene_url: str,
-        file_ext: DatotekaFormatEnum,
-        stupci_cijena: List[str],
-        separator: str,
-    ) -> None:
-        """
-        Inicijalizacija Enum klase sa podacima o pojedinom trgovačkom lancu.
+    Args:
+        name (str): Naziv trgovačkog lanca.
 
-        Args:
-            base_url (str): Glavna stranica trgovačkog lanca.
-            cijene_url (str): Stranica cijena trgovačkog lanca (kod nekih je u json obliku).
-            file_ext (DatotekaFormatEnum): Ekstenzija datoteka cijena.
-            stupci_cijena (List[str]): Stupci/tagovi cijena u datotekama cijena.
-            separator (str): Separator csv datoteka.
-        """
-        self.base_url = base_url
-        self.cijene_url = cijene_url
-        self.file_ext = file_ext
-        self.stupci_cijena = stupci_cijena
-        self.separator = separator
+    Returns:
+        TrgLanacInfo: Podaci o trgovačkom lancu.
+    """
+    return TRG_LANCI[name]
 
-    def __str__(self) -> str:
-        """
-        Enum ime kao string.
-        """
-        return self.name
 
-    def __repr__(self) -> str:
-        """
-        Detaljan prikaz za debugging.
-        """
-        return (
-            f"TrgLanci.{self.name}: base={self.base_url}, cijene={self.cijene_url}, file_ext={self.file_ext}, "
-            f"separator={self.separator}"
-        )
+class TrgLanci:
+    """
+    Popis trgovačkih lanaca sa pripadajućim URL-ovima i separatorima (lanci koji dostavljaju .csv datoteke).
+
+    Zadržava pristup kao kod Enuma (npr. TrgLanci.KONZUM), a članovi su TrgLanacInfo
+    objekti iz TRG_LANCI.
+    """
+
+    BOSO = TRG_LANCI["BOSO"]
+    DM = TRG_LANCI["DM"]
+    EUROSPIN = TRG_LANCI["EUROSPIN"]
+    KAUFLAND = TRG_LANCI["KAUFLAND"]
+    KONZUM = TRG_LANCI["KONZUM"]
+    KTC = TRG_LANCI["KTC"]
+    LIDL = TRG_LANCI["LIDL"]
+    METRO = TRG_LANCI["METRO"]
+    NTL = TRG_LANCI["NTL"]
+    PLODINE = TRG_LANCI["PLODINE"]
+    RIBOLA = TRG_LANCI["RIBOLA"]
+    SPAR = TRG_LANCI["SPAR"]
+    STUDENAC = TRG_LANCI["STUDENAC"]
+    TOMMY = TRG_LANCI["TOMMY"]
+    TRGOCENTAR = TRG_LANCI["TRGOCENTAR"]
+    TRGOVINA_KRK = TRG_LANCI["TRGOVINA_KRK"]
+    VRUTAK = TRG_LANCI["VRUTAK"]
+    ZABAC = TRG_LANCI["ZABAC"]
@@ -2,12 +2,13 @@ import decimal
 import logging
 import math
 import re
-from datetime import datetime
 from decimal import ROUND_HALF_UP, Decimal
 from typing import Annotated, Any, Dict, List, Optional
 
 from environs import env
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+
+from src.utils.date_utils import DATE_FORMAT, get_today, parse_datum
 
 # Custom tipovi podataka
 PositiveInt = Annotated[int, Field(gt=0, description="Must be a positive integer")]
@@ -16,6 +17,31 @@ ProductCode = Annotated[
 ]
 NazivProizvoda = Annotated[str, Field(min_length=1, max_length=200)]
 
+OPTIONAL_STR_FIELDS = (
+    "sifra_proizv",
+    "marka_proizv",
+    "neto_kolicina",
+    "jedinica_mjere",
+    "kategorija",
+)
+CIJENE_FIELDS = (
+    "cijena_mpc",
+    "cijena_jed_mjere",
+    "cijena_posebna",
+    "cijena_najniza_30",
+    "cijena_sidrena",
+)
+
+# Regex patterni koji se koriste u validatorima (kompajlirani jednom)
+_WS_RE = re.compile(r"\s+")
+_LEAD_RE = re.compile(r"^[^A-Ža-ž0-9\'].*?(?=[A-Ža-ž0-9\'])")
+
+# Kvantizator za zaokruživanje cijena na 2 decimale (dijeli se između poziva)
+_QUANT = Decimal("0.00")
+
+# Vrijednosti opcionalnih string polja koje se spremaju kao None
+_NULLISH = frozenset({"", "nan", "0", "#", "NaN", "None", "NONE", "none"})
+
 
 class CijenaDTO(BaseModel):
     """
@@ -23,11 +49,15 @@ class CijenaDTO(BaseModel):
     """
 
     model_config = ConfigDict(
-        validate_assignment=True,
+        # Objekt se nakon kreiranja ne mijenja (promjene preko model_copy)
+        validate_assignment=False,
+        frozen=True,
         use_enum_values=True,
         strict=False,
         extra="forbid",
-        validate_default=True,
+        # Default vrijednosti su None/False pa ih nije potrebno validirati
+        validate_default=False,
+        revalidate_instances="never",
         str_strip_whitespace=True,
     )
 
@@ -125,79 +155,59 @@ class CijenaDTO(BaseModel):
             raise ValueError(error_msg)
 
         if isinstance(value, str):
-            pattern = r"^[^A-Ža-ž0-9\'].*?(?=[A-Ža-ž0-9\'])"
             value = value.strip()
             # Za slučajeve kada unutar naziva proizvoda postoji više od jednog whitespacea
-            value = re.sub(r"\s+", " ", value)
-            value = re.sub(pattern, "", value)
+            value = _WS_RE.sub(" ", value)
+            value = _LEAD_RE.sub("", value)
 
         return value.upper()
 
-    @field_validator(
-        "sifra_proizv",
-        "marka_proizv",
-        "neto_kolicina",
-        "jedinica_mjere",
-        "kategorija",
-        mode="before",
-    )
+    @field_validator(*OPTIONAL_STR_FIELDS, mode="before")
     @classmethod
-    def validate_optional_str_fields(cls, value: Optional[str]) -> Optional[str]:
+    def validate_optional_str_fields(
+        cls, value: Optional[str], info: ValidationInfo
+    ) -> Optional[str]:
         """
         Validacija i čišćenje polja sifra_proizv, marka_proizv, neto_kolicina, jedinica_mjere i kategorija.
 
         Args:
             value(Optional[str]): Šifra proizvoda/Marka proizvoda/Neto količina/Jedinica mjere/Kategorija.
+            info(ValidationInfo): Informacije o polju koje se validira.
 
         Returns:
              Optional[str]: Validiran i očišćen sifra_proizv, marka_proizv, neto_kolicina, jedinica_mjere i kategorija ili None.
         """
-        if (
-            value is None
-            or (isinstance(value, str) and not value.strip())
-            or value in ["nan", "0", "#", "NaN", "None", "NONE", "none"]
-        ):
-            return None
+        return cls._clean_optional_str(value, info.field_name)
 
-        if isinstance(value, str):
-            value = value.strip().upper()
-
-        return value
-
-    @field_validator("sifra_proizv", mode="before")
-    @classmethod
-    def validate_sifra_proizv(cls, value: Optional[str]) -> Optional[str]:
+    @staticmethod
+    def _clean_optional_str(value: Optional[str], field_name: str) -> Optional[str]:
         """
-        Validacija i čišćenje polja sifra_proizv.
-        Kod KONZUM-a, šifre proizvoda imaju '.0' kao završetak pa je ovo potrebno.
+        Čišćenje opcionalnog string polja (zajedničko za validator i from_trusted).
 
         Args:
-            value(Optional[str]): Šifra proizvoda.
+            value(Optional[str]): Vrijednost polja.
+            field_name(str): Naziv polja.
 
         Returns:
-             Optional[str]: Validirana i očišćena šifra proizvoda.
+            Optional[str]: Očišćena vrijednost ili None.
         """
-        if isinstance(value, str):
-            if value[-2:] == ".0":
+        if field_name == "sifra_proizv":
+            # Kod KONZUM-a, šifre proizvoda imaju '.0' kao završetak pa je ovo potrebno
+            if isinstance(value, str) and value[-2:] == ".0":
                 value = value[:-2]
+        elif field_name == "neto_kolicina":
+            # Kod NTL-a, neto_kolicina pocinje sa ',' pa treba dodati 0 ispred
+            if value and value.startswith(","):
+                value = f"0{value}"
 
-        return value
-
-    @field_validator("neto_kolicina", mode="before")
-    @classmethod
-    def validate_neto_kolicina(cls, value: Optional[str]) -> Optional[str]:
-        """
-        Validacija i čišćenje polja neto_kolicina.
-        Kod NTL-a, neto_kolicina pocinje sa ',' pa treba dodati 0 ispred.
-
-        Args:
-            value(Optional[str]): Neto količina.
+        if value is None:
+            return None
 
-        Returns:
-            Optional[str]: Validirana i očišćena neto količina.
-        """
-        if value and value.startswith(","):
-            value = f"0{value}"
+        if isinstance(value, str):
+            stripped = value.strip()
+            if not stripped or value in _NULLISH:
+                return None
+            return stripped.upper()
 
         return value
 
@@ -222,18 +232,19 @@ class CijenaDTO(BaseModel):
 
         if isinstance(value, str):
             value = value.strip()
+        else:
+            # Numerički barkod (int/float) se pretvara u string samo jednom
+            value = str(value)
 
         # Ovaj uvjet je potreban jer BOSO ima barkod '1234567891234.0'
-        if value[-2:] == ".0":
+        if value.endswith(".0"):
             # logging.warning(f'Barkod ne smije sadržavati sadržavati ".", dobiveno: {value}')
             value = value[:-2]
 
-        if not re.match(r"^[0-9]+$", value):
-            # logging.warning(f'Barkod smije sadržavati samo znamenke, dobiveno: {value}')
-            return None
-
-        if len(value) < 8 or len(value) > 13:
-            # logging.warning(f'Barkod mora imati između 8 i 13 znamenki, dobiveno: {value}')
+        # Prvo jeftina provjera duljine, zatim samo ASCII znamenke (isdigit bez
+        # isascii prihvaća i npr. '²')
+        if not (8 <= len(value) <= 13 and value.isascii() and value.isdigit()):
+            # logging.warning(f'Barkod mora imati između 8 i 13 znamenki (samo znamenke), dobiveno: {value}')
             return None
 
         return value
@@ -258,31 +269,22 @@ class CijenaDTO(BaseModel):
             if not value.strip():
                 return None
 
-        datum_cij = datetime.strptime(value, env("DATE_FORMAT"))
-        trenutni_datum = datetime.strptime(
-            datetime.now().strftime(env("DATE_FORMAT")), env("DATE_FORMAT")
-        )
-        if datum_cij > trenutni_datum:
-            error_msg = "Datum ne smije biti veći od trenutnog datuma"
-            logging.error(error_msg)
-            raise ValueError(error_msg)
-
         try:
-            datetime.strptime(value, env("DATE_FORMAT"))
-            return value
+            datum_cij = parse_datum(value, DATE_FORMAT)
         except ValueError as e:
             error_msg = "Datum od mora biti u formatu dd.mm.YYYY!"
             logging.error(error_msg)
             raise ValueError(error_msg) from e
 
-    @field_validator(
-        "cijena_mpc",
-        "cijena_jed_mjere",
-        "cijena_posebna",
-        "cijena_najniza_30",
-        "cijena_sidrena",
-        mode="before",
-    )
+        trenutni_datum = get_today()
+        if datum_cij > trenutni_datum:
+            error_msg = "Datum ne smije biti veći od trenutnog datuma"
+            logging.error(error_msg)
+            raise ValueError(error_msg)
+
+        return value
+
+    @field_validator(*CIJENE_FIELDS, mode="before")
     @classmethod
     def validate_cijene(cls, value: Optional[Decimal]) -> Optional[Decimal]:
         """
@@ -304,15 +306,25 @@ class CijenaDTO(BaseModel):
             or (isinstance(value, float) and math.isnan(value))
         ):
             return None
+        # DM ima cijenu sa -
         if isinstance(value, str):
             value = value.replace(",", ".").strip()
-
-        # DM ima cijenu sa -
-        if str(value)[0] == "-":
-            value = Decimal(str(value)[1:])
+            if value.startswith("-"):
+                value = Decimal(value[1:])
+        elif isinstance(value, Decimal):
+            # Decimal (npr. iz normalize_price_column) se ne konvertira ponovno preko str
+            value = value.copy_abs()
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = abs(value)
+        else:
+            value_str = str(value)
+            if value_str[:1] == "-":
+                value = Decimal(value_str[1:])
 
         try:
-            return Decimal(str(value)).quantize(Decimal("0.00"), rounding=ROUND_HALF_UP)
+            if not isinstance(value, Decimal):
+                value = Decimal(str(value))
+            return value.quantize(_QUANT, rounding=ROUND_HALF_UP)
         except (ValueError, TypeError, decimal.InvalidOperation) as e:
             error_msg = (
                 f"Greška prilikom validacije cijene {value} (type: {type(value)}): {e}"
@@ -320,7 +332,79 @@ class CijenaDTO(BaseModel):
             logging.error(error_msg)
             return None
 
-    def to_dict(self):
+    @classmethod
+    def clean_row(cls, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Čišćenje vrijednosti jednog retka istim metodama kao i kod validacije (istim
+        redoslijedom kao u Pydanticu), bez kreiranja CijenaDTO objekta.
+
+        Args:
+            raw (Dict[str, Any]): Vrijednosti polja CijenaDTO objekta.
+
+        Returns:
+            Dict[str, Any]: Novi dictionary sa očišćenim vrijednostima.
+        """
+        values = dict(raw)
+        values["naziv_proizv"] = cls.validate_naziv_proizv(values["naziv_proizv"])
+
+        for field in OPTIONAL_STR_FIELDS:
+            if field in values:
+                values[field] = cls._clean_optional_str(values[field], field)
+
+        if "barkod" in values:
+            values["barkod"] = cls.validate_barkod(values["barkod"])
+        if "datum" in values:
+            values["datum"] = cls.validate_datum(values["datum"])
+
+        for field in CIJENE_FIELDS:
+            if field in values:
+                values[field] = cls.validate_cijene(values[field])
+
+        return values
+
+    @classmethod
+    def from_trusted(cls, **values: Any) -> "CijenaDTO":
+        """
+        Kreiranje CijenaDTO objekta za podatke koje je parser već pripremio.
+
+        Vrijednosti se čiste sa clean_row, a objekt se kreira sa model_construct pa se
+        preskaču constrainti polja i ostatak Pydantic validacije.
+
+        Args:
+            **values (Any): Vrijednosti polja CijenaDTO objekta.
+
+        Returns:
+            CijenaDTO: CijenaDTO objekt sa očišćenim vrijednostima.
+        """
+        return cls.model_construct(**cls.clean_row(values))
+
+    @classmethod
+    def build_batch(cls, rows: List[Dict[str, Any]]) -> List["CijenaDTO"]:
+        """
+        Kreiranje liste CijenaDTO objekata za sve retke jedne datoteke.
+
+        Ako je postavljena varijabla okruženja PMCT_TRUSTED_INPUT, retci se samo čiste
+        i kreiraju sa from_trusted (bez Pydantic validacije), inače se svaki redak
+        validira sa model_validate.
+
+        Args:
+            rows (List[Dict[str, Any]]): Retci sa vrijednostima polja CijenaDTO objekta.
+
+        Returns:
+            List[CijenaDTO]: Lista CijenaDTO objekata.
+        """
+        if env.bool("PMCT_TRUSTED_INPUT", False):
+            return [cls.from_trusted(**row) for row in rows]
+
+        return [cls.model_validate(row) for row in rows]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Konverzija CijenaDTO objekta u dictionary (brže od model_dump).
+
+        Returns:
+            Dict[str, Any]: Dictionary sa svim poljima objekta.
+        """
         return {
             "pmda_id": self.pmda_id,
             "naziv_proizv": self.naziv_proizv,
@@ -342,8 +426,7 @@ class CijenaDTO(BaseModel):
     @staticmethod
     def as_dict(dto_list: List["CijenaDTO"]) -> List[Dict[str, Any]]:
         """
-        Konverzija liste CijenaDTO u listu dictonarya koristeći Pydantic model_dump
-        za serijalizaciju svakog objekta.
+        Konverzija liste CijenaDTO u listu dictonarya koristeći to_dict za svaki objekt.
 
         Args:
             dto_list (List[CijenaDTO]): Lista CijenaDTO objekata za konverziju.
@@ -354,7 +437,7 @@ class CijenaDTO(BaseModel):
         if not dto_list:
             return []
 
-        return [dto.model_dump() for dto in dto_list]
+        return [dto.to_dict() for dto in dto_list]
 
     def __str__(self) -> str:
         """
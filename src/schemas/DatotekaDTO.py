@@ -1,12 +1,12 @@
 import logging
 import re
-from datetime import datetime
 from enum import Enum, IntEnum
 from typing import Annotated, Any, Dict, List, Optional
 
-from environs import env
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from src.utils.date_utils import DATE_FORMAT, get_today, parse_datum
+
 
 class StatusEnum(IntEnum):
     """
@@ -35,6 +35,9 @@ NonEmptyStr = Annotated[
     str, Field(min_length=1, description="Ne smije biti prazan string")
 ]
 
+# Nepodržani znakovi u nazivu datoteke (kompajlirano jednom)
+_FNAME_RE = re.compile(r'[<>:"/\\|?*]')
+
 
 # noinspection PyNestedDecorators
 class DatotekaDTO(BaseModel):
@@ -53,8 +56,10 @@ class DatotekaDTO(BaseModel):
         strict=True,
         # Zabranjuje dodatna polja
         extra="forbid",
-        # Validacija default vrijednosti prema constraintovima polja
-        validate_default=True,
+        # Default vrijednosti (None) se ne validiraju prema constraintovima polja
+        validate_default=False,
+        # Postojeće instance se ne validiraju ponovno kad se proslijede modelu
+        revalidate_instances="never",
         # Custom serialization
         ser_json_bytes="utf8",
         # Frozen model (nakon kreacije nije moguće mijenjanje)
@@ -112,7 +117,7 @@ class DatotekaDTO(BaseModel):
             logging.error(error_msg)
             raise ValueError(error_msg)
 
-        if re.search(r'[<>:"/\\|?*]', value):
+        if _FNAME_RE.search(value):
             error_msg = "Naziv datoteke sadrži ne podržane znakove!"
             logging.error(error_msg)
             raise ValueError(error_msg)
@@ -135,27 +140,43 @@ class DatotekaDTO(BaseModel):
         Raise:
             ValueError: Ako datum nije u formatu dd.mm.YYYY ili ako je veći od trenutnog datuma.
         """
-        datum_dat = datetime.strptime(value, env("DATE_FORMAT"))
-        trenutni_datum = datetime.strptime(
-            datetime.now().strftime(env("DATE_FORMAT")), env("DATE_FORMAT")
-        )
-        if datum_dat > trenutni_datum:
-            error_msg = "Datum ne smije biti veći od trenutnog datuma"
-            logging.error(error_msg)
-            raise ValueError(error_msg)
-
         try:
-            datetime.strptime(value, env("DATE_FORMAT"))
-            return value
+            datum_dat = parse_datum(value, DATE_FORMAT)
         except ValueError as e:
             error_msg = "Datum od mora biti u formatu dd.mm.YYYY!"
             logging.error(error_msg)
             raise ValueError(error_msg) from e
 
+        trenutni_datum = get_today()
+        if datum_dat > trenutni_datum:
+            error_msg = "Datum ne smije biti veći od trenutnog datuma"
+            logging.error(error_msg)
+            raise ValueError(error_msg)
+
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Konverzija DatotekaDTO objekta u dictionary (brže od model_dump).
+
+        Returns:
+            Dict[str, Any]: Dictionary sa svim poljima objekta.
+        """
+        return {
+            "pmpr_id": self.pmpr_id,
+            "pmpo_id": self.pmpo_id,
+            "dat_naziv": self.dat_naziv,
+            "dat_format": self.dat_format,
+            "status": self.status,
+            "datum_objave": self.datum_objave,
+            "dat_naziv_zip": self.dat_naziv_zip,
+            "broj_pohrane": self.broj_pohrane,
+        }
+
     @staticmethod
     def as_dict(dto_list: List["DatotekaDTO"]) -> List[Dict[str, Any]]:
         """
-        Konverzija liste DatotekaDTO u listu dictonarya koristeći Pydantic model_dump.
+        Konverzija liste DatotekaDTO u listu dictonarya koristeći to_dict.
 
         Args:
             dto_list(List['DatotekaDTO']): Lista DatotekaDTO objekata za konverziju.
@@ -163,7 +184,7 @@ class DatotekaDTO(BaseModel):
         Returns:
             List[Dict[str, Any]]: Lista dictionarya koji sadrže DatotekaDTO polja kao vrijednosti.
         """
-        return [dto.model_dump() for dto in dto_list]
+        return [dto.to_dict() for dto in dto_list]
 
     def __str__(self) -> str:
         """
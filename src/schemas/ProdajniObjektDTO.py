@@ -1,11 +1,11 @@
 import logging
-from datetime import datetime
 from enum import Enum
 from typing import Annotated, Any, Dict, List, Optional
 
-from environs import env
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from src.utils.date_utils import DATE_FORMAT, get_today, parse_datum
+
 
 class ProdajniObjektOblikEnum(str, Enum):
     """
@@ -62,7 +62,10 @@ class ProdajniObjektDTO(BaseModel):
         use_enum_values=True,
         strict=True,
         extra="forbid",
-        validate_default=True,
+        # Sva polja su obavezna pa model nema default vrijednosti. Novo polje čiji
+        # default treba validirati mora imati Field(validate_default=True).
+        validate_default=False,
+        revalidate_instances="never",
         ser_json_bytes="utf8",
         frozen=True,
         str_strip_whitespace=True,
@@ -100,28 +103,42 @@ class ProdajniObjektDTO(BaseModel):
         Raise:
             ValueError: Ako datum nije u formatu dd.mm.YYYY ili ako je veći od trenutnog datuma.
         """
-        datum_po = datetime.strptime(value, env("DATE_FORMAT"))
-        trenutni_datum = datetime.strptime(
-            datetime.now().strftime(env("DATE_FORMAT")), env("DATE_FORMAT")
-        )
-        if datum_po > trenutni_datum:
-            error_msg = f"Datum {datum_po} ne smije biti veći od trenutnog datuma {trenutni_datum}"
-            logging.error(error_msg)
-            raise ValueError(error_msg)
-
         try:
-            datetime.strptime(value, env("DATE_FORMAT"))
-            return value
+            datum_po = parse_datum(value, DATE_FORMAT)
         except ValueError as e:
             error_msg = f"Datum {value} mora biti u formatu dd.mm.YYYY!"
             logging.error(error_msg)
             raise ValueError(error_msg) from e
 
+        trenutni_datum = get_today()
+        if datum_po > trenutni_datum:
+            error_msg = f"Datum {datum_po} ne smije biti veći od trenutnog datuma {trenutni_datum}"
+            logging.error(error_msg)
+            raise ValueError(error_msg)
+
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Konverzija ProdajniObjektDTO objekta u dictionary (brže od model_dump).
+
+        Returns:
+            Dict[str, Any]: Dictionary sa svim poljima objekta.
+        """
+        return {
+            "pmtl_id": self.pmtl_id,
+            "pmna_id": self.pmna_id,
+            "adresa": self.adresa,
+            "oblik": self.oblik,
+            "oznaka": self.oznaka,
+            "datum_od": self.datum_od,
+        }
+
     @staticmethod
     def as_dict(dto_list: List["ProdajniObjektDTO"]) -> List[Dict[str, Any]]:
         """
-        Konverzija liste ProdajniObjektDTO u listu dictonarya koristeći Pydantic model_dump
-        za serijalizaciju svakog objekta.
+        Konverzija liste ProdajniObjektDTO u listu dictonarya koristeći to_dict za
+        svaki objekt.
 
         Args:
             dto_list (List[ProdajniObjektDTO]): Lista ProdajniObjektDTO objekata za konverziju.
@@ -132,7 +149,7 @@ class ProdajniObjektDTO(BaseModel):
         if not dto_list:
             return []
 
-        return [dto.model_dump() for dto in dto_list]
+        return [dto.to_dict() for dto in dto_list]
 
     def __str__(self) -> str:
         """
@@ -2,47 +2,155 @@ import decimal
 import logging
 import math
 import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from decimal import ROUND_HALF_UP, Decimal
+from functools import partial
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Deque, Iterator, List, Optional
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
-from src.models.TrgovackiLanci import TrgLanci
+from src.models.TrgovackiLanci import TrgLanacInfo
 
+try:
+    import pyarrow  # noqa: F401
 
-def read_data_file(lanac: TrgLanci, file_path: Path) -> Optional[DataFrame]:
+    _PYARROW_DOSTUPAN = True
+except ImportError:
+    _PYARROW_DOSTUPAN = False
+
+# Decimal je immutable pa se kvantizator i nula kreiraju jednom, a ne za svaku cijenu
+_QUANT = Decimal("0.00")
+_ZERO = Decimal("0")
+
+
+def _lstrip_spaces(series: pd.Series) -> pd.Series:
+    """
+    Brisanje razmaka na početku stringova u stupcu (vrijednosti koje nisu stringovi
+    ostaju nepromijenjene, a stringovi od samih razmaka postaju NaN).
+
+    Args:
+        series (pd.Series): Tekstualni stupac.
+
+    Returns:
+        pd.Series: Stupac bez razmaka na početku vrijednosti.
+    """
+    try:
+        stripped = series.str.lstrip(" ")
+    except AttributeError:
+        # Stupac ne sadrži stringove
+        return series
+
+    stripped = stripped.where(stripped.notna(), series)
+    return stripped.mask(stripped == "")
+
+
+def _has_temporal_columns(df: DataFrame) -> bool:
+    """
+    Provjera da li je PyArrow neki stupac pročitao kao datum ili vrijeme (npr.
+    2025-01-02 postaje datetime.date, a C engine ga ostavlja kao string).
+
+    Args:
+        df (DataFrame): DataFrame pročitan sa PyArrow engineom.
+
+    Returns:
+        bool: True ako DataFrame ima stupac sa datumima ili vremenima.
+    """
+    for col in df.columns:
+        if df[col].dtype.kind in ("M", "m"):
+            return True
+        if df[col].dtype == object and pd.api.types.infer_dtype(
+            df[col], skipna=True
+        ) in ("date", "time", "datetime"):
+            return True
+    return False
+
+
+def read_csv_pyarrow(file: Any, **pandas_kwargs: Any) -> Optional[DataFrame]:
+    """
+    Čitanje csv datoteke sa PyArrow engineom (višedretveno parsiranje), a rezultat
+    ostaje NumPy DataFrame (dtype_backend="pyarrow" bi prazne ćelije pretvorio u
+    '<NA>' stringove).
+
+    PyArrow ne podržava skipinitialspace pa se razmaci nakon separatora brišu iz
+    naziva stupaca i tekstualnih stupaca nakon čitanja.
+
+    PyArrow uvijek prepoznaje datume i vremena (ISO format) koje C engine ostavlja
+    kao stringove pa se takve datoteke čitaju sa C engineom (vraća se None).
+
+    Args:
+        file (Any): Putanja, URL ili file objekt csv datoteke.
+        **pandas_kwargs (Any): Parametri za pd.read_csv.
+
+    Returns:
+        Optional[DataFrame]: DataFrame sa podacima ili None ako pyarrow nije instaliran,
+                             ne može pročitati datoteku ili je prepoznao datume
+                             (koristiti C engine).
+    """
+    if not _PYARROW_DOSTUPAN:
+        return None
+
+    skip_initial_space = pandas_kwargs.pop("skipinitialspace", False)
+
+    try:
+        df = pd.read_csv(file, engine="pyarrow", **pandas_kwargs)
+    except ValueError as e:
+        logging.warning(
+            f"PyArrow engine nije uspio pročitati {file}, koristim C engine: {e}"
+        )
+        # File objekt se vraća na početak za čitanje sa C engineom
+        if hasattr(file, "seek"):
+            file.seek(0)
+        return None
+
+    if _has_temporal_columns(df):
+        logging.info(f"PyArrow engine je prepoznao datume u {file}, koristim C engine.")
+        if hasattr(file, "seek"):
+            file.seek(0)
+        return None
+
+    if skip_initial_space:
+        df.columns = [
+            col.lstrip(" ") if isinstance(col, str) else col for col in df.columns
+        ]
+        text_columns = df.select_dtypes(include=["object", "string"]).columns
+        if len(text_columns) > 0:
+            df[text_columns] = df[text_columns].apply(_lstrip_spaces)
+
+    return df
+
+
+def read_data_file(
+    lanac: TrgLanacInfo, file_path: Path, normalize_prices: bool = False
+) -> Optional[DataFrame]:
     """
     Čitanje datoteke sa cijenama sa lokalnog diska.
 
     Args:
-        lanac (TrgLanci): Trgovački lanac.
+        lanac (TrgLanacInfo): Trgovački lanac.
         file_path (Path): Putanja datoteke sa lokalnog diska.
+        normalize_prices (bool): Ako je True, stupci sa cijenama (lanac.stupci_cijena)
+                                 se odmah konvertiraju u Decimal (normalize_price_column).
 
     Returns:
         Optional[DataFrame]: DataFrame sa podacima ili None ako nema podataka.
 
     Raises:
          FileNotFoundError: Ako datoteka nije pronađena.
+         PermissionError: Ako nema prava za čitanje datoteke.
          EmptyDataError: Ako je datoteka prazna ili nema validne podatke.
          ParserError: Ako se dogodila greška prilikom parsiranja (krivi delimiter ili format datoteke).
          UnicodeDecodeError: Ako je greška u encodingu.
          MemoryError: Ako je datoteka prevelika za učitavanje.
     """
     try:
-        if not os.access(file_path, os.R_OK):
-            logging.error(f"Nema prava za čitanje datoteke: {file_path}.")
-            return None
-
-        if not os.path.exists(file_path):
-            logging.error(f"Datoteka {file_path} ne postoji.")
-            raise FileNotFoundError(f"Datoteka {file_path} ne postoji.")
-
         if not str(file_path).lower().endswith(".csv"):
             logging.warning(f"Datoteka {file_path} nema ekstenziju .csv.")
 
-        df = pd.read_csv(
+        df = read_csv_pyarrow(
             file_path,
             sep=lanac.separator,
             header=0,
@@ -52,10 +160,29 @@ def read_data_file(lanac: TrgLanci, file_path: Path) -> Optional[DataFrame]:
             on_bad_lines="warn",
         )
 
+        if df is None:
+            df = pd.read_csv(
+                file_path,
+                sep=lanac.separator,
+                header=0,
+                encoding="utf-8",
+                na_values=[""],
+                skipinitialspace=True,
+                on_bad_lines="warn",
+            )
+
+        if normalize_prices:
+            for col in lanac.stupci_cijena:
+                if col in df.columns:
+                    df[col] = normalize_price_column(df[col])
+
         return df
     except FileNotFoundError:
         logging.error(f"Datoteka {file_path} nije pronađena!")
         return None
+    except PermissionError:
+        logging.error(f"Nema prava za čitanje datoteke: {file_path}.")
+        return None
     except pd.errors.EmptyDataError:
         logging.error(f"Datoteka {file_path} je prazna ili nema validne podatke!")
         return None
@@ -77,6 +204,46 @@ def read_data_file(lanac: TrgLanci, file_path: Path) -> Optional[DataFrame]:
         return None
 
 
+def read_data_files_parallel(
+    lanac: TrgLanacInfo, paths: List[Path]
+) -> Iterator[Optional[DataFrame]]:
+    """
+    Paralelno čitanje više datoteka sa cijenama sa lokalnog diska (read_data_file
+    u ProcessPoolExecutor workerima). Stupci sa cijenama se konvertiraju u Decimal
+    već u workerima.
+
+    DataFrameovi se vraćaju jedan po jedan, a istovremeno se čita najviše
+    2 * broj workera datoteka, tako da u memoriji nisu sve datoteke odjednom.
+
+    Skripta koja poziva ovu funkciju mora imati if __name__ == "__main__" blok
+    (spawn na Windowsima ponovno importa skriptu u svakom workeru).
+
+    Args:
+        lanac (TrgLanacInfo): Trgovački lanac.
+        paths (List[Path]): Putanje datoteka sa lokalnog diska.
+
+    Yields:
+        Optional[DataFrame]: DataFrameovi istim redoslijedom kao paths (None za
+                             datoteke koje nije moguće pročitati).
+    """
+    if not paths:
+        return
+
+    max_workers = os.cpu_count() or 1
+    read_file = partial(read_data_file, lanac, normalize_prices=True)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures: Deque[Future] = deque()
+
+        for path in paths:
+            if len(futures) >= 2 * max_workers:
+                yield futures.popleft().result()
+            futures.append(executor.submit(read_file, path))
+
+        while futures:
+            yield futures.popleft().result()
+
+
 def remove_decimals(value: Any) -> Any:
     """
     Provjerava da li cijena ima više od 2 decimalna mjesta, ako ima,
@@ -88,8 +255,10 @@ def remove_decimals(value: Any) -> Any:
     Returns:
         Any: Vrijednost nakon provjere.
     """
-    if str(value) != "nan":
-        value_str = str(value).strip()
+    value_str = value if isinstance(value, str) else str(value)
+
+    if value_str != "nan":
+        value_str = value_str.strip()
 
         if "." not in value_str:
             return value_str
@@ -114,21 +283,77 @@ def to_decimal(value: Any) -> Any:
         Decimal: U ovisnosti o proslijeđenoj vrijednosti: 0 ili decimalni broj
     """
     try:
+        # Decimal vrijednost nije potrebno ponovno parsirati iz stringa
+        if isinstance(value, Decimal):
+            return value.quantize(_QUANT, rounding=ROUND_HALF_UP)
         if (
             value is None
             or value == ""
             or (isinstance(value, float) and math.isnan(value))
         ):
-            return Decimal("0")
+            return _ZERO
         if isinstance(value, str):
             value = value.replace(",", ".")
             if value == "":
-                return Decimal("0")
-        return Decimal(str(value)).quantize(Decimal("0.00"), rounding=ROUND_HALF_UP)
+                return _ZERO
+        return Decimal(str(value)).quantize(_QUANT, rounding=ROUND_HALF_UP)
     except (ValueError, TypeError, decimal.InvalidOperation):
         # Ovo je zakomentirano jer ima jako puno non numeric vrijednosti pa da ne guši log file.
         # logging.warning(f'Neispravna numerička vrijednost: {value} (type: {type(value)}), koristim 0.')
-        return Decimal("0")
+        return _ZERO
+
+
+def price_to_decimal(value: Any) -> Decimal:
+    """
+    Spojeni remove_decimals i to_decimal u jednom prolazu (jedna str konverzija po
+    ćeliji). Cijena se skraćuje na 2 decimale (ako ima točno jednu '.') i zatim
+    zaokružuje na 2 decimalna mjesta.
+
+    Args:
+        value (Any): Vrijednost pročitana iz datoteke (stupci koji sadrže cijene).
+
+    Returns:
+        Decimal: U ovisnosti o proslijeđenoj vrijednosti: 0 ili decimalni broj
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return _ZERO
+
+    value_str = str(value).strip()
+    integer_part, separator, decimal_part = value_str.partition(".")
+
+    if separator and "." not in decimal_part:
+        value_str = f"{integer_part}.{decimal_part[:2]}"
+
+    try:
+        return Decimal(value_str.replace(",", ".")).quantize(
+            _QUANT, rounding=ROUND_HALF_UP
+        )
+    except (ValueError, TypeError, decimal.InvalidOperation):
+        return _ZERO
+
+
+def normalize_price_column(s: pd.Series) -> pd.Series:
+    """
+    Zamjena za df[col].apply(remove_decimals).apply(to_decimal) nad cijelim stupcem.
+
+    Cijene se u stupcu jako ponavljaju pa se stupac prvo faktorizira (pd.factorize),
+    remove_decimals i to_decimal se izvršavaju samo jednom za svaku različitu
+    vrijednost, a stupac se slaže indeksiranjem NumPy polja (prazne ćelije imaju
+    kod -1 i dobivaju 0).
+
+    Args:
+        s (pd.Series): Stupac sa cijenama pročitan iz datoteke.
+
+    Returns:
+        pd.Series: Stupac sa Decimal vrijednostima (0 za prazne i neispravne).
+    """
+    codes, uniques = pd.factorize(s)
+    decimals = np.array(
+        [to_decimal(remove_decimals(value)) for value in uniques] + [_ZERO],
+        dtype=object,
+    )
+
+    return pd.Series(decimals[codes], index=s.index, name=s.name, dtype=object)
 
 
 def add_leading_zero(value: Any) -> Any:
@@ -142,8 +367,14 @@ def add_leading_zero(value: Any) -> Any:
     Returns:
         Any: Vrijednost nakon dodavanja 0 ako je potrebno.
     """
-    if str(value)[0] == ",":
-        return f"0{str(value)}"
+    if isinstance(value, str):
+        if value.startswith(","):
+            return f"0{value}"
+        return value
+
+    value_str = str(value)
+    if value_str.startswith(","):
+        return f"0{value_str}"
     return value
 
 
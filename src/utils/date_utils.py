@@ -0,0 +1,73 @@
+from datetime import date, datetime, timedelta
+from time import monotonic
+from typing import Tuple
+
+from environs import env
+
+# .env se čita u Logger klasi, ali se DTO moduli mogu importati prije nje
+env.read_env()
+
+# Format datuma se dohvaća jednom prilikom importa, a ne u svakom validatoru ili
+# skripti (ako nije postavljen u .env, koristi se dd.mm.YYYY)
+DATE_FORMAT: str = env.str("DATE_FORMAT", "%d.%m.%Y")
+
+# Trenutni datum se u validatorima DTO-ova čita za svaki redak, pa se pamti
+# (monotonic trenutak isteka, datum)
+_TODAY_TTL_SEC = 60.0
+_TODAY_CACHE: Tuple[float, date] = (0.0, date.min)
+
+
+def get_today() -> date:
+    """
+    Dohvaćanje trenutnog datuma (date.today()) koji se pamti najviše 60 sekundi,
+    a nikad preko ponoći.
+
+    Returns:
+        date: Trenutni datum.
+    """
+    global _TODAY_CACHE
+
+    expires_at, today = _TODAY_CACHE
+    now_mono = monotonic()
+    if now_mono < expires_at:
+        return today
+
+    now = datetime.now()
+    until_midnight = (
+        datetime.combine(now.date() + timedelta(days=1), datetime.min.time()) - now
+    ).total_seconds()
+    _TODAY_CACHE = (now_mono + min(_TODAY_TTL_SEC, until_midnight), now.date())
+
+    return now.date()
+
+
+def parse_datum(value: str, date_format: str) -> date:
+    """
+    Parsiranje datuma iz stringa prema proslijeđenom formatu.
+
+    Za format dd.mm.YYYY (%d.%m.%Y) datum se čita direktno iz znakova stringa, što je
+    višestruko brže od datetime.strptime. Ostali formati i datumi bez vodećih nula
+    (npr. 1.1.2025) se parsiraju sa datetime.strptime.
+
+    Args:
+        value (str): Datum.
+        date_format (str): Format datuma (npr. DATE_FORMAT).
+
+    Returns:
+        date: Parsirani datum.
+
+    Raises:
+        ValueError: Ako datum nije u proslijeđenom formatu ili nije valjan.
+    """
+    if (
+        date_format == "%d.%m.%Y"
+        and len(value) == 10
+        and value[2] == "."
+        and value[5] == "."
+        and value[0:2].isdigit()
+        and value[3:5].isdigit()
+        and value[6:10].isdigit()
+    ):
+        return date(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+
+    return datetime.strptime(value, date_format).date()
@@ -1,22 +1,75 @@
 import logging
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple, TypeVar
 
 from environs import env
 
 from src.database.db_connection import OracleDBConn
-from src.models.TrgovackiLanci import TrgLanci
+from src.models.TrgovackiLanci import TrgLanacInfo
 from src.schemas.CijenaDTO import CijenaDTO
 from src.schemas.DatotekaDTO import DatotekaDTO
 from src.schemas.ProdajniObjektDTO import ProdajniObjektDTO
 
+# SQL upiti se dohvaćaju prilikom importa pa se .env čita ovdje, neovisno o tome
+# koji je modul importan prije (read_env ne mijenja već postavljene varijable)
+env.read_env()
+
+# SQL upiti iz .env se dohvaćaju jednom prilikom importa, a ne kod svakog poziva
+_SQL = {
+    key: env(key)
+    for key in (
+        "GET_ID_TL",
+        "GET_PRAVILO_ZA_TL",
+        "GET_ID_NASELJA",
+        "GET_PRODAJNI_OBJEKT_ID",
+        "INSERT_PRODAJNI_OBJEKT",
+        "INSERT_DATOTEKE",
+        "GET_ID_STATUS_DATOTEKE",
+        "INSERT_CJENICI",
+        "UPDATE_STATUS_DATOTEKE",
+    )
+}
+
+# Opcionalni PL/SQL blok koji zapisuje datoteku (MERGE) i vraća njen ID i status
+# (:pmda_id, :dat_status) u jednom pozivu. Ako nije postavljen, koriste se
+# INSERT_DATOTEKE i GET_ID_STATUS_DATOTEKE.
+_SQL_MERGE_DATOTEKA: Optional[str] = env.str("MERGE_DATOTEKA", None)
+
+# ID-evi trgovačkih lanaca, pravila, naselja i prodajnih objekata se ne mijenjaju
+# tijekom izvršavanja skripte pa se pamte nakon prvog dohvata (None se ne pamti
+# jer se nakon toga prodajni objekt zapisuje i ponovno dohvaća)
+_TL_ID_CACHE: Dict[str, int] = {}
+_PRAVILO_ID_CACHE: Dict[int, int] = {}
+_NASELJE_ID_CACHE: Dict[str, int] = {}
+_PRODAJNI_OBJEKT_ID_CACHE: Dict[Tuple[int, str], int] = {}
+
+# Broj redaka cijena koji se zapisuje u jednom executemany pozivu
+_CHUNK = 5000
+
+_T = TypeVar("_T")
+
+
+def _chunked(items: List[_T], size: int) -> Iterator[List[_T]]:
+    """
+    Podjela liste na uzastopne dijelove od najviše size elemenata.
+
+    Args:
+        items (List[_T]): Lista za podjelu.
+        size (int): Maksimalan broj elemenata u jednom dijelu.
+
+    Returns:
+        Iterator[List[_T]]: Dijelovi liste istim redoslijedom.
+    """
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
 
-def get_tl_id(db: OracleDBConn, lanac: TrgLanci) -> int | None:
+def get_tl_id(db: OracleDBConn, lanac: TrgLanacInfo) -> int | None:
     """
     Dohvaćanje ID-a trgovačkog lanca prema proslijeđenom trgovačkom lancu.
 
     Args:
         db (OracleDBConn): Konekcija na bazu podataka.
-        lanac (TrgLanci): Trgovački lanac.
+        lanac (TrgLanacInfo): Trgovački lanac.
 
     Returns:
         int | None: ID trgovačkog lanca ili None ako ga nije moguće pronaći.
@@ -24,33 +77,26 @@ def get_tl_id(db: OracleDBConn, lanac: TrgLanci) -> int | None:
     Raises:
         ValueError: Ako se dogodi greška prilikom dohvata ID-a trgovačkog lanca.
     """
+    if lanac.name in _TL_ID_CACHE:
+        return _TL_ID_CACHE[lanac.name]
+
     try:
-        if lanac == TrgLanci.TRGOVINA_KRK:
-            pmtl_id = db.execute_query(
-                env("GET_ID_TL"),
-                params={"naziv": lanac.name.replace("_", " ").upper()},
-            )
-        elif lanac == TrgLanci.ZABAC:
-            pmtl_id = db.execute_query(
-                env("GET_ID_TL"),
-                params={"naziv": lanac.name.replace("Z", "Ž").upper()},
-            )
-        else:
-            pmtl_id = db.execute_query(
-                env("GET_ID_TL"), params={"naziv": lanac.name.upper()}
-            )
+        pmtl_id = db.execute_query(
+            _SQL["GET_ID_TL"], params={"naziv": lanac.display_name}
+        )
 
         if not pmtl_id:
             logging.warning(
-                f"Nije moguće pronaći ID trgovačkog lanca {lanac.name.upper()}!"
+                f"Nije moguće pronaći ID trgovačkog lanca {lanac.display_name}!"
             )
             raise
         else:
             pmtl_id = pmtl_id[0][0]
+            _TL_ID_CACHE[lanac.name] = pmtl_id
 
         return pmtl_id
     except Exception as e:
-        error_msg = f"Dogodila se greška prilikom dohvaćanja ID-a trgovačkog lanca {lanac.name.upper()}: {e}"
+        error_msg = f"Dogodila se greška prilikom dohvaćanja ID-a trgovačkog lanca {lanac.display_name}: {e}"
         logging.error(error_msg)
         raise ValueError(error_msg) from e
 
@@ -69,9 +115,12 @@ def get_pravilo_id(db: OracleDBConn, pmtl_id: int) -> int | None:
     Raises:
         ValueError: Ako se dogodi greška prilikom dohvata ID-a pravila za trgovački lanac.
     """
+    if pmtl_id in _PRAVILO_ID_CACHE:
+        return _PRAVILO_ID_CACHE[pmtl_id]
+
     try:
         pmpr_id = db.execute_query(
-            env("GET_PRAVILO_ZA_TL"), params={"pmtl_id": pmtl_id}
+            _SQL["GET_PRAVILO_ZA_TL"], params={"pmtl_id": pmtl_id}
         )
 
         if not pmpr_id:
@@ -81,6 +130,7 @@ def get_pravilo_id(db: OracleDBConn, pmtl_id: int) -> int | None:
             pmpr_id = None
         else:
             pmpr_id = pmpr_id[0][0]
+            _PRAVILO_ID_CACHE[pmtl_id] = pmpr_id
 
         return pmpr_id
     except Exception as e:
@@ -103,15 +153,18 @@ def get_id_naselja(db: OracleDBConn, naziv_naselja: str) -> int:
     Raises:
         ValueError: Ako nije moguće pronaći ID naselja.
     """
-    pmna_id = db.execute_query(
-        env("GET_ID_NASELJA"), params={"naziv": f"{naziv_naselja}"}
-    )
+    if naziv_naselja in _NASELJE_ID_CACHE:
+        return _NASELJE_ID_CACHE[naziv_naselja]
+
+    pmna_id = db.execute_query(_SQL["GET_ID_NASELJA"], params={"naziv": naziv_naselja})
 
     if not pmna_id:
         error_msg = f"Nije moguće pronaći ID naselja {naziv_naselja}!"
         logging.error(error_msg)
         raise ValueError(error_msg)
 
+    _NASELJE_ID_CACHE[naziv_naselja] = pmna_id[0][0]
+
     return pmna_id[0][0]
 
 
@@ -130,9 +183,12 @@ def get_prodajni_objekt_id(db: OracleDBConn, pmtl_id: int, ducan_id: str) -> int
     Raises:
         ValueError: Ako se dogodi greška prilikom dohvata ID-a prodajnog objekta.
     """
+    if (pmtl_id, ducan_id) in _PRODAJNI_OBJEKT_ID_CACHE:
+        return _PRODAJNI_OBJEKT_ID_CACHE[(pmtl_id, ducan_id)]
+
     try:
         pmpo_id = db.execute_query(
-            env("GET_PRODAJNI_OBJEKT_ID"),
+            _SQL["GET_PRODAJNI_OBJEKT_ID"],
             params={"pmtl_id": pmtl_id, "ducan_id": ducan_id},
         )
 
@@ -143,6 +199,7 @@ def get_prodajni_objekt_id(db: OracleDBConn, pmtl_id: int, ducan_id: str) -> int
             pmpo_id = None
         else:
             pmpo_id = pmpo_id[0][0]
+            _PRODAJNI_OBJEKT_ID_CACHE[(pmtl_id, ducan_id)] = pmpo_id
 
         return pmpo_id
     except Exception as e:
@@ -163,13 +220,41 @@ def insert_new_prodajni_objekt(db: OracleDBConn, po_dto: ProdajniObjektDTO) -> N
         RuntimeError: Ako se dogodi greška prilikom zapisivanja podataka u bazu.
     """
     try:
-        db.execute_query(env("INSERT_PRODAJNI_OBJEKT"), params=po_dto.model_dump())
+        db.execute_query(_SQL["INSERT_PRODAJNI_OBJEKT"], params=po_dto.to_dict())
     except Exception as e:
         error_msg = f"Greška prilikom zapisivanja prodajnog objekta: {e}"
         logging.error(error_msg)
         raise RuntimeError(error_msg) from e
 
 
+def insert_prodajni_objekti(db: OracleDBConn, po_dtos: List[ProdajniObjektDTO]) -> int:
+    """
+    Zapisivanje podataka o više prodajnih objekata jednim batch upitom (executemany).
+    Prodajni objekti koji već postoje u bazi se preskaču.
+
+    Args:
+        db (OracleDBConn): Konekcija na bazu podataka.
+        po_dtos (List[ProdajniObjektDTO]): Lista popunjenih DTO objekata sa podacima o
+                                           prodajnim objektima.
+
+    Returns:
+        int: Broj zapisanih prodajnih objekata.
+
+    Raises:
+        RuntimeError: Ako se dogodi greška prilikom zapisivanja podataka u bazu.
+    """
+    try:
+        return db.execute_many(
+            _SQL["INSERT_PRODAJNI_OBJEKT"],
+            params_list=ProdajniObjektDTO.as_dict(po_dtos),
+            skip_duplicates=True,
+        )
+    except Exception as e:
+        error_msg = f"Greška prilikom zapisivanja prodajnih objekata: {e}"
+        logging.error(error_msg)
+        raise RuntimeError(error_msg) from e
+
+
 def insert_datoteka_into_db(db: OracleDBConn, datoteka_dto: DatotekaDTO) -> None:
     """
     Zapisivanje podataka o datoteci sa cijenama (pogledati DatotekaDTO objekt).
@@ -182,7 +267,7 @@ def insert_datoteka_into_db(db: OracleDBConn, datoteka_dto: DatotekaDTO) -> None
         RuntimeError: Ako se dogodi greška prilikom zapisivanja podataka u bazu.
     """
     try:
-        db.execute_query(env("INSERT_DATOTEKE"), params=datoteka_dto.model_dump())
+        db.execute_query(_SQL["INSERT_DATOTEKE"], params=datoteka_dto.to_dict())
     except Exception as e:
         error_msg = f"Greška prilikom zapisivanja datoteke: {e}"
         logging.error(error_msg)
@@ -212,7 +297,7 @@ def get_datoteka_id_and_status(
 
     try:
         result = db.execute_query(
-            env("GET_ID_STATUS_DATOTEKE"),
+            _SQL["GET_ID_STATUS_DATOTEKE"],
             params={"pmpo_id": pmpo_id, "datum_objave": datum_cijena},
         )
 
@@ -231,6 +316,52 @@ def get_datoteka_id_and_status(
         raise ValueError(error_msg) from e
 
 
+def upsert_datoteka(
+    db: OracleDBConn, datoteka_dto: DatotekaDTO
+) -> tuple[int | None, int | None]:
+    """
+    Zapisivanje podataka o datoteci sa cijenama (ako već ne postoji) i dohvaćanje
+    ID-a i statusa datoteke.
+
+    Ako je u .env postavljen MERGE_DATOTEKA, oboje se radi jednim pozivom na bazu,
+    a inače sa insert_datoteka_into_db i get_datoteka_id_and_status.
+
+    Args:
+        db (OracleDBConn): Konekcija na bazu podataka.
+        datoteka_dto (DatotekaDTO): Popunjeni DTO objekt sa podacima o datoteci sa cijenama.
+
+    Returns:
+        tuple[int | None, int | None]: ID i status datoteke ili None
+
+    Raises:
+        RuntimeError: Ako se dogodi greška prilikom zapisivanja podataka u bazu.
+        ValueError: Ako je došlo do greške prilikom dohvata ID-a i statusa datoteke.
+    """
+    if _SQL_MERGE_DATOTEKA is None:
+        insert_datoteka_into_db(db, datoteka_dto)
+        return get_datoteka_id_and_status(
+            db, datoteka_dto.pmpo_id, datoteka_dto.datum_objave
+        )
+
+    try:
+        result = db.execute_returning(
+            _SQL_MERGE_DATOTEKA,
+            params=datoteka_dto.to_dict(),
+            out_vars=["pmda_id", "dat_status"],
+        )
+    except Exception as e:
+        error_msg = f"Greška prilikom zapisivanja datoteke: {e}"
+        logging.error(error_msg)
+        raise RuntimeError(error_msg) from e
+
+    if result["pmda_id"] is None:
+        logging.warning(
+            f"Nije moguće pronaći ID datoteke za pmpo_id {datoteka_dto.pmpo_id} i datum objave {datoteka_dto.datum_objave}!"
+        )
+
+    return result["pmda_id"], result["dat_status"]
+
+
 def insert_cijene_into_db(db: OracleDBConn, cijene_dto: List[CijenaDTO]) -> int:
     """
     Zapisivanje podataka o cijenama u bazu podataka prema proslijeđenoj listi CijenaDTO objekata.
@@ -248,10 +379,18 @@ def insert_cijene_into_db(db: OracleDBConn, cijene_dto: List[CijenaDTO]) -> int:
     inserted_rows = 0
 
     try:
-        inserted_rows += db.execute_many(
-            env("INSERT_CJENICI"), params_list=CijenaDTO.as_dict(cijene_dto)
-        )
+        # Zapisivanje u dijelovima od _CHUNK redaka da jedan round trip ne bude
+        # prevelik. Commit je jedan, nakon zadnjeg dijela, da greška u bilo kojem
+        # dijelu poništi cijelu datoteku (status datoteke ostaje nepromijenjen).
+        for batch in _chunked(cijene_dto, _CHUNK):
+            inserted_rows += db.execute_many(
+                _SQL["INSERT_CJENICI"],
+                params_list=CijenaDTO.as_dict(batch),
+                commit=False,
+            )
+        db.commit()
     except Exception as e:
+        db.rollback()
         error_msg = f"Dogodila se greška prilikom zapisivanja cijena: {e}"
         logging.error(error_msg)
         raise ValueError(error_msg) from e
@@ -276,7 +415,7 @@ def update_datoteka_status(
     """
     try:
         updated_rows = db.execute_query(
-            env("UPDATE_STATUS_DATOTEKE"),
+            _SQL["UPDATE_STATUS_DATOTEKE"],
             params={
                 "pmpo_id": pmpo_id,
                 "naziv_datoteke": file_name,
@@ -1,29 +1,22 @@
+import codecs
 import logging
 from io import BytesIO, StringIO
 from pathlib import Path
+from typing import Any, Dict
 
 import chardet
 import pandas as pd
 from pandas import DataFrame
 
-from src.models.TrgovackiLanci import TrgLanci
+from src.models.TrgovackiLanci import TrgLanacInfo, TrgLanci
+from src.utils.data.data_utils import read_csv_pyarrow
 
-
-def _fix_croatian_characters(text: str) -> str:
-    """
-    Zamjena heksadecimalnih znakova sa odgovarajućim hrvatskim diakriticima.
-
-    Args:
-        text (str): Tekst iz datoteke sa cijenama trgovačkog lanca.
-
-    Returns:
-        str: Ispravljen tekst.
-    """
-    if pd.isna(text) or not isinstance(text, str):
-        return text
-
-    replacements = {
-        # Windows-1252 mapiranje hrvatskih diakritika
+# Windows-1252 mapiranje hrvatskih diakritika (sve zamjene su znak za znak pa se
+# rade jednim str.translate prolazom umjesto zamjene za svaki znak posebno).
+# str.maketrans prihvaća samo ključeve od jednog znaka, a zamjenu više znakova
+# bi trebalo dodati kao jedan kompajlirani regex (re.sub sa dictionary lookupom).
+_CROATIAN_TABLE = str.maketrans(
+    {
         "\x8a": "š",
         "\x8c": "ć",
         "\x8e": "ž",
@@ -42,13 +35,47 @@ def _fix_croatian_characters(text: str) -> str:
         "©": "š",
         "®": "ž",
     }
+)
 
-    fixed_text = text
+# Encoding se dohvaća iz prvih 256 KB datoteke (dovoljno za detekciju)
+ENCODING_SAMPLE_SIZE = 256 * 1024
 
-    for hexa, hrv in replacements.items():
-        fixed_text = fixed_text.replace(hexa, hrv)
 
-    return fixed_text
+def _fix_croatian_characters(text: str) -> str:
+    """
+    Zamjena heksadecimalnih znakova sa odgovarajućim hrvatskim diakriticima.
+
+    Args:
+        text (str): Tekst iz datoteke sa cijenama trgovačkog lanca.
+
+    Returns:
+        str: Ispravljen tekst.
+    """
+    if pd.isna(text) or not isinstance(text, str):
+        return text
+
+    return text.translate(_CROATIAN_TABLE)
+
+
+def _fix_croatian_series(series: pd.Series) -> pd.Series:
+    """
+    Zamjena heksadecimalnih znakova sa hrvatskim diakriticima nad cijelim stupcem
+    (Series.str.translate). Vrijednosti koje nisu stringovi ostaju nepromijenjene.
+
+    Args:
+        series (pd.Series): Stupac iz datoteke sa cijenama trgovačkog lanca.
+
+    Returns:
+        pd.Series: Ispravljen stupac.
+    """
+    try:
+        translated = series.str.translate(_CROATIAN_TABLE)
+    except AttributeError:
+        # Stupac ne sadrži stringove
+        return series
+
+    # .str vraća NaN za vrijednosti koje nisu stringovi, one se vraćaju iz originala
+    return translated.where(translated.notna(), series)
 
 
 def _fix_croatian_csv(
@@ -57,10 +84,13 @@ def _fix_croatian_csv(
     encoding: str,
     file_name: str,
     output_file: str = None,
+    persist: bool = True,
     **pandas_kwargs,
 ) -> DataFrame:
     """
     Čitanje csv datoteke sa krivim encodingom i ispravljanje hrvatskih diakritika.
+    Datoteke sa ISO datumima se čitaju sa C engineom (read_csv_pyarrow vraća None)
+    da se na disk spremaju datumi kao u izvornoj datoteci.
 
     Args:
         input_file (str): Datoteka u kojoj se ispravljaju hrvatski znakovi.
@@ -68,6 +98,8 @@ def _fix_croatian_csv(
                          i izvorni file.
         encoding (str): Encoding datoteke koja se ispravlja.
         output_file (str): Lokacija/naziv ispravljene datoteke. Default = None
+        persist (bool): Ako je True, ispravljena datoteka se sprema na disk
+                        (output_file). Default = True
 
     Returns:
         DataFrame: Podaci iz konvertirane datoteke.
@@ -77,16 +109,20 @@ def _fix_croatian_csv(
 
     logging.info(f"Čitanje {file_name} sa encodingom: {encoding}")
 
-    df = pd.read_csv(input_file, encoding=encoding, **pandas_kwargs)
+    df = read_csv_pyarrow(input_file, encoding=encoding, **pandas_kwargs)
+    if df is None:
+        df = pd.read_csv(input_file, encoding=encoding, **pandas_kwargs)
 
-    for column in df.columns:
-        if df[column].dtype == "object":
-            df[column] = df[column].apply(_fix_croatian_characters)
+    # Tekstualni stupci se odabiru jednom ("string" za StringDtype stupce u pandas 3)
+    text_columns = df.select_dtypes(include=["object", "string"]).columns
+    if len(text_columns) > 0:
+        df[text_columns] = df[text_columns].apply(_fix_croatian_series)
 
     # Ispravljanje naziva stupaca
     df.columns = [_fix_croatian_characters(col) for col in df.columns]
 
-    df.to_csv(output_file, sep=separator, encoding="utf-8", index=False)
+    if persist:
+        df.to_csv(output_file, sep=separator, encoding="utf-8", index=False)
 
     return df
 
@@ -95,7 +131,8 @@ def change_file_encoding(
     url: str | BytesIO | StringIO | Path,
     datum_cijena: str,
     file_name: str,
-    lanac: TrgLanci,
+    lanac: TrgLanacInfo,
+    persist: bool = True,
 ) -> DataFrame:
     """
     Konverzija u UTF-8 encoding datoteke.
@@ -107,7 +144,10 @@ def change_file_encoding(
                                         ili Path za datoteke spremljene lokalno.
         datum_cijena (str): Datum objave cijena.
         file_name (str): Naziv datoteke.
-        lanac (TrgLanci): Naziv trgovačkog lanca.
+        lanac (TrgLanacInfo): Naziv trgovačkog lanca.
+        persist (bool): Ako je True, konvertirana datoteka se sprema u
+                        C:\\Cijene\\<datum>\\<lanac>. File readeri čitaju već spremljene
+                        datoteke pa je ne trebaju ponovno zapisivati. Default = True
 
     Returns:
         DataFrame: Podaci iz konvertirane csv datoteke.
@@ -119,6 +159,7 @@ def change_file_encoding(
             output_file=rf"C:\Cijene\{datum_cijena}\{lanac.name if lanac != TrgLanci.TRGOVINA_KRK else lanac.name.replace('_', ' ')}\{file_name}",
             encoding="windows-1252",  # ili 'windows-1250'
             file_name=file_name,
+            persist=persist,
             sep=lanac.separator,
             header=0,
             na_values=[""],
@@ -135,9 +176,47 @@ def change_file_encoding(
         raise
 
 
+def detect_encoding(raw_data: bytes) -> Dict[str, Any]:
+    """
+    Dohvaćanje encodinga iz sadržaja datoteke (zamjena za chardet.detect, vraća
+    dictionary sa istim ključevima encoding i confidence).
+
+    Većina datoteka je u UTF-8 pa se prvo provjerava BOM, ASCII i da li se sadržaj
+    može dekodirati kao UTF-8. Tek ako ne može, encoding se pogađa sa chardet.detect.
+    ASCII se vraća samo za cijelu datoteku, a odrezani uzorak bez ne-ASCII znakova
+    (ENCODING_SAMPLE_SIZE bajtova) se smatra UTF-8 datotekom.
+
+    Args:
+        raw_data (bytes): Sadržaj datoteke.
+
+    Returns:
+        Dict[str, Any]: Dictionary sa encodingom i confidencom.
+    """
+    if raw_data.startswith(codecs.BOM_UTF8):
+        return {"encoding": "UTF-8-SIG", "confidence": 1.0}
+
+    if raw_data.isascii():
+        # Uzorak od ENCODING_SAMPLE_SIZE bajtova je samo početak datoteke pa ostatak
+        # može sadržavati hrvatske znakove (utf-8 je nadskup ASCII-ja)
+        if len(raw_data) >= ENCODING_SAMPLE_SIZE:
+            return {"encoding": "utf-8", "confidence": 1.0}
+
+        # chardet za sadržaj bez ne-ASCII znakova vraća ascii (skripte razlikuju utf-8)
+        return {"encoding": "ascii", "confidence": 1.0}
+
+    try:
+        # final=False dozvoljava nepotpun UTF-8 znak na kraju (ako je sadržaj odrezan)
+        codecs.getincrementaldecoder("utf-8")().decode(raw_data, final=False)
+    except UnicodeDecodeError:
+        return chardet.detect(raw_data)
+
+    return {"encoding": "utf-8", "confidence": 1.0}
+
+
 def detect_local_file_encoding(file_path: Path) -> str:
     """
-    Dohvaća se encoding sa datoteke koja se nalazi na lokalnom disku.
+    Dohvaća se encoding sa datoteke koja se nalazi na lokalnom disku (iz prvih
+    ENCODING_SAMPLE_SIZE bajtova datoteke).
 
     Args:
         file_path (Path): Path datoteke sa lokalnog diska.
@@ -148,8 +227,8 @@ def detect_local_file_encoding(file_path: Path) -> str:
     logging.info(f"Dohvaćam encoding datoteke {file_path}...")
 
     with open(file_path, "rb") as file:  # Open in binary mode
-        raw_data = file.read()
-        result = chardet.detect(raw_data)
+        raw_data = file.read(ENCODING_SAMPLE_SIZE)
+        result = detect_encoding(raw_data)
 
         logging.info(
             f"Encoding datoteke je {result['encoding']} sa {result['confidence']} confidenca."
@@ -4,32 +4,35 @@ from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import List
+from typing import Any, List, Optional
 
 from environs import env
 
 
-def send_mail(
+def _build_message(
+    from_address: str,
     v_subject: str,
     v_body: str,
     to_address: List[str] | str,
     log_dir: str,
     log_name: str,
     send_log_file: bool,
-) -> None:
+) -> MIMEMultipart:
     """
-    Šalje mail unutar kojega se nalaze proslijeđena poruka i opcionalno log file.
+    Kreiranje maila sa proslijeđenom porukom i opcionalno log fileom.
 
     Args:
+        from_address (str): Pošiljatelj maila.
         v_subject (str): Subject maila.
         v_body (str): Poruka maila.
         to_address (List[str] | str): Primatelj/i maila.
         log_dir (str): Direktorij u kojemu se nalazi log file.
         log_name (str): Naziv log filea.
         send_log_file (bool): Da li se šalje log file ili ne.
-    """
-    from_address = env("SENDER_MAIL_ADDRESS")
 
+    Returns:
+        MIMEMultipart: Mail spreman za slanje.
+    """
     msg = MIMEMultipart()
 
     msg["From"] = from_address
@@ -43,17 +46,118 @@ def send_mail(
     msg.attach(MIMEText(body, "plain", "utf-8"))
 
     if send_log_file:
-        attachment = open(os.path.join(log_dir, log_name), "rb")
-
         part = MIMEBase("application", "octet-stream")
-        part.set_payload(attachment.read())
+        with open(os.path.join(log_dir, log_name), "rb") as attachment:
+            part.set_payload(attachment.read())
         encoders.encode_base64(part)
         part.add_header("Content-Disposition", "attachment; filename= %s" % log_name)
 
         msg.attach(part)
 
-    # Port 25 za mogućnost anonimnog slanja
-    server = smtplib.SMTP("mail.hnb.hr", 25)
-    text = msg.as_string()
-    server.sendmail(from_address, to_address, text)
-    server.quit()
+    return msg
+
+
+class MailClient:
+    """
+    SMTP klijent koji drži otvorenu konekciju na mail server za više mailova
+    (koristi se kao context manager).
+
+    Primjer:
+        with MailClient() as client:
+            client.send(...)
+            client.send(...)
+    """
+
+    def __init__(self, host: str = "mail.hnb.hr", port: int = 25) -> None:
+        """
+        Inicijalizacija SMTP klijenta.
+
+        Args:
+            host (str): Mail server (default: mail.hnb.hr).
+            port (int): Port mail servera (default: 25 za mogućnost anonimnog slanja).
+        """
+        self.host: str = host
+        self.port: int = port
+        self.from_address: str = env("SENDER_MAIL_ADDRESS")
+        self.smtp: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "MailClient":
+        """
+        Spajanje na mail server.
+
+        Returns:
+            MailClient: Klijent spojen na mail server.
+        """
+        self.smtp = smtplib.SMTP(self.host, self.port)
+        return self
+
+    def send(
+        self,
+        v_subject: str,
+        v_body: str,
+        to_address: List[str] | str,
+        log_dir: str,
+        log_name: str,
+        send_log_file: bool,
+    ) -> None:
+        """
+        Šalje mail unutar kojega se nalaze proslijeđena poruka i opcionalno log file.
+
+        Args:
+            v_subject (str): Subject maila.
+            v_body (str): Poruka maila.
+            to_address (List[str] | str): Primatelj/i maila.
+            log_dir (str): Direktorij u kojemu se nalazi log file.
+            log_name (str): Naziv log filea.
+            send_log_file (bool): Da li se šalje log file ili ne.
+
+        Raises:
+            RuntimeError: Ako klijent nije spojen na mail server.
+        """
+        if self.smtp is None:
+            raise RuntimeError("MailClient nije spojen na mail server!")
+
+        msg = _build_message(
+            self.from_address,
+            v_subject,
+            v_body,
+            to_address,
+            log_dir,
+            log_name,
+            send_log_file,
+        )
+        self.smtp.sendmail(self.from_address, to_address, msg.as_string())
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """
+        Prekidanje konekcije na mail server.
+        """
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            finally:
+                self.smtp = None
+
+
+def send_mail(
+    v_subject: str,
+    v_body: str,
+    to_address: List[str] | str,
+    log_dir: str,
+    log_name: str,
+    send_log_file: bool,
+) -> None:
+    """
+    Šalje mail unutar kojega se nalaze proslijeđena poruka i opcionalno log file.
+    Za slanje više mailova koristiti MailClient (jedna konekcija za sve mailove).
+
+    Args:
+        v_subject (str): Subject maila.
+        v_body (str): Poruka maila.
+        to_address (List[str] | str): Primatelj/i maila.
+        log_dir (str): Direktorij u kojemu se nalazi log file.
+        log_name (str): Naziv log filea.
+        send_log_file (bool): Da li se šalje log file ili ne.
+    """
+    with MailClient() as client:
+        client.send(v_subject, v_body, to_address, log_dir, log_name, send_log_file)
@@ -1,15 +1,41 @@
 import logging
-import time
 
-import chardet
 import requests
-
-from src.models.TrgovackiLanci import TrgLanci
-
-
-def _check_website_availability(trg_lanac: TrgLanci) -> bool:
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from src.models.TrgovackiLanci import TrgLanacInfo, TrgLanci
+from src.utils.file_encoding import ENCODING_SAMPLE_SIZE, detect_encoding
+
+# Ponovni pokušaji sa eksponencijalnim čekanjem (1, 2, 4... najviše 30 sekundi),
+# uz poštivanje Retry-After headera kod 429 i 503. Ostali 4xx statusi se ne
+# ponavljaju, a trajnom greškom se smatraju tek kada ih potvrdi GET zahtjev.
+_RETRY = Retry(
+    total=8,
+    backoff_factor=1,
+    # backoff_max postoji od urllib3 2.0 (zato urllib3>=2.0.0 u pyproject.toml)
+    backoff_max=30,
+    status_forcelist=[429, 502, 503, 504],
+    allowed_methods=["HEAD", "GET"],
+    respect_retry_after_header=True,
+    # Nakon zadnjeg pokušaja vraća se response, a ne RetryError
+    raise_on_status=False,
+)
+
+# Jedan Session za sve zahtjeve da se TCP/TLS konekcije ponovno koriste. _RETRY je
+# montiran na _SESSION pa vrijedi i za preuzimanje sadržaja i za find_encoding.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_RETRY)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+
+def _check_website_availability(trg_lanac: TrgLanacInfo) -> bool:
     """
-    Provjera da li je web-stranica sa cijenama trgovačkog lanca dostupna.
+    Provjera da li je web-stranica sa cijenama trgovačkog lanca dostupna. Ponovni
+    pokušaji (429, 502, 503, 504, timeout i greške u konekciji) se rade u _RETRY.
+    Ako HEAD ne vrati 2xx status, provjera se ponavlja sa GET zahtjevom pa se 4xx
+    status smatra trajnom greškom tek kada ga vrati i GET.
 
     Args:
         trg_lanac (str): Trgovački lanac na čiju se web-stranicu pokušava spojiti.
@@ -18,50 +44,54 @@ def _check_website_availability(trg_lanac: TrgLanci) -> bool:
         bool: True ako je web-stranica dostupna ili False ako je nedostupna nakon maksimalnog broja pokušaja.
     """
     timeout = 30
-    retries = 120
-
-    for attempt in range(retries):
-        try:
-            logging.info(
-                f"Provjera dostupnosti web-stranice {trg_lanac.cijene_url}: {attempt + 1}/{retries}..."
-            )
-            response = requests.Session().get(trg_lanac.cijene_url, timeout=timeout)
-
-            if response.status_code == 200:
-                logging.info(f"Stranica trgovačkog lanca {trg_lanac.name} je dostupna.")
-                logging.info("-" * 100)
-                return True
-            elif response.status_code == 503:
-                logging.info(
-                    f"Stranica trgovačkog lanca {trg_lanac.name} je privremeno nedostupna."
-                )
-                time.sleep(5)
-                continue
-            else:
-                logging.warning(
-                    f"Stranica trgovačkog lanca {trg_lanac.name} je nedostupna: {response.status_code}."
-                )
-                logging.info("-" * 100)
-
-        except requests.exceptions.Timeout:
-            logging.warning(f"Timeout: {attempt + 1}...")
-        except requests.exceptions.ConnectionError:
-            logging.warning(f"Greška u konekciji: {attempt + 1}...")
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Greška u zahtjevu: {e}...")
-
-        if attempt < retries - 1:
-            wait_time = 2**attempt
-            logging.info(
-                f"Čekam {wait_time} sekundi prije ponovnog pokušaja spajanja..."
-            )
-            time.sleep(wait_time)
-
-    logging.error("Web-stranica nije dostupna nakon maksimalnog broja pokušaja!")
+
+    try:
+        logging.info(f"Provjera dostupnosti web-stranice {trg_lanac.cijene_url}...")
+        # HEAD ne preuzima sadržaj stranice, samo provjerava dostupnost
+        response = _SESSION.head(
+            trg_lanac.cijene_url, timeout=timeout, allow_redirects=True
+        )
+        if not 200 <= response.status_code < 300:
+            # Neki serveri ne podržavaju HEAD (405, 501, 403...) pa se dostupnost
+            # provjerava sa GET bez preuzimanja sadržaja
+            response = _SESSION.get(trg_lanac.cijene_url, timeout=timeout, stream=True)
+            response.close()
+    except requests.exceptions.Timeout:
+        logging.error(
+            "Web-stranica nije dostupna nakon maksimalnog broja pokušaja (timeout)!"
+        )
+        return False
+    except requests.exceptions.ConnectionError:
+        logging.error(
+            "Web-stranica nije dostupna nakon maksimalnog broja pokušaja (greška u konekciji)!"
+        )
+        return False
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Greška u zahtjevu: {e}...")
+        return False
+
+    if 200 <= response.status_code < 300:
+        logging.info(f"Stranica trgovačkog lanca {trg_lanac.name} je dostupna.")
+        logging.info("-" * 100)
+        return True
+    elif 400 <= response.status_code < 500 and response.status_code != 429:
+        logging.error(
+            f"Stranica trgovačkog lanca {trg_lanac.name} je nedostupna: {response.status_code} (potvrđeno GET zahtjevom, ne pokušava se ponovno)."
+        )
+    elif response.status_code == 503:
+        logging.error(
+            f"Stranica trgovačkog lanca {trg_lanac.name} je privremeno nedostupna nakon maksimalnog broja pokušaja!"
+        )
+    else:
+        logging.warning(
+            f"Stranica trgovačkog lanca {trg_lanac.name} je nedostupna: {response.status_code}."
+        )
+    logging.info("-" * 100)
+
     return False
 
 
-def get_data_from_source(trg_lanac: TrgLanci, datum: str) -> str | None:
+def get_data_from_source(trg_lanac: TrgLanacInfo, datum: str) -> str | None:
     """
     Preuzimanje HTML-a web-stranice sa cijenama. Ako je trgovački lanac DM, vraća json.
 
@@ -71,14 +101,22 @@ def get_data_from_source(trg_lanac: TrgLanci, datum: str) -> str | None:
 
     Returns:
         str | None: HTML u obliku string ili None ako nema podataka za proslijeđeni datum.
+
+    Raises:
+        RuntimeError: Ako web-stranica nije dostupna.
     """
     logging.info(
         f"Preuzimanje datoteka cijena za trgovački lanac {trg_lanac.name} i datum {datum}."
     )
     logging.info(100 * "-")
 
-    with requests.get(trg_lanac.cijene_url) as response:
-        _check_website_availability(trg_lanac)
+    # Prvo se provjerava dostupnost, a tek onda se jednom preuzima sadržaj stranice
+    if not _check_website_availability(trg_lanac):
+        raise RuntimeError(
+            f"Web-stranica trgovačkog lanca {trg_lanac.name} ({trg_lanac.cijene_url}) nije dostupna!"
+        )
+
+    response = _SESSION.get(trg_lanac.cijene_url, timeout=30)
     try:
         if trg_lanac == TrgLanci.DM or trg_lanac == TrgLanci.KAUFLAND:
             return response.json()
@@ -92,7 +130,8 @@ def get_data_from_source(trg_lanac: TrgLanci, datum: str) -> str | None:
 
 def find_encoding(full_url: str) -> str:
     """
-    Dohvaća se encoding sa URL-a datoteke koji se koristi prilikom parsiranja iste.
+    Dohvaća se encoding sa URL-a datoteke koji se koristi prilikom parsiranja iste
+    (iz prvih ENCODING_SAMPLE_SIZE bajtova datoteke).
 
     Args:
         full_url (str): URL datoteke.
@@ -102,7 +141,11 @@ def find_encoding(full_url: str) -> str:
     """
     logging.info(f"Dohvaćam encoding datoteke {full_url}...")
 
-    detected = chardet.detect(requests.get(full_url).content)
+    # Preuzima se samo početak datoteke, a ne cijela datoteka
+    with _SESSION.get(full_url, stream=True) as response:
+        raw_data = response.raw.read(ENCODING_SAMPLE_SIZE, decode_content=True)
+
+    detected = detect_encoding(raw_data)
     confidence = detected["confidence"]
 
     logging.info(
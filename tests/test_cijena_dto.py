@@ -0,0 +1,75 @@
+import re
+from decimal import Decimal
+
+import pytest
+from environs import env
+
+from src.schemas.CijenaDTO import CijenaDTO
+
+# Bind varijable INSERT_CJENICI upita (redoslijed kao u to_dict)
+INSERT_CJENICI_BINDS = [
+    "pmda_id",
+    "naziv_proizv",
+    "sifra_proizv",
+    "marka_proizv",
+    "neto_kolicina",
+    "jedinica_mjere",
+    "cijena_mpc",
+    "cijena_jed_mjere",
+    "cijena_posebna",
+    "cijena_posebna_flag",
+    "cijena_najniza_30",
+    "cijena_sidrena",
+    "barkod",
+    "kategorija",
+    "datum",
+]
+
+ROW = {
+    "pmda_id": 1,
+    "naziv_proizv": "Mlijeko 2,8%",
+    "sifra_proizv": "12",
+    "marka_proizv": "Dukat",
+    "neto_kolicina": "1 l",
+    "jedinica_mjere": "kom",
+    "cijena_mpc": Decimal("1.29"),
+    "cijena_jed_mjere": "1,29",
+    "cijena_posebna": Decimal("0.99"),
+    "barkod": "3850000000001",
+    "kategorija": "MLIJEKO",
+    "datum": "02.01.2025",
+}
+
+
+@pytest.fixture
+def dto_list() -> list:
+    validiran = CijenaDTO(**ROW)
+    return [
+        validiran,
+        CijenaDTO.from_trusted(**ROW),
+        validiran.model_copy(
+            update={"cijena_posebna_flag": True, "cijena_mpc": Decimal("0.99")}
+        ),
+    ]
+
+
+def test_as_dict_kljucevi_odgovaraju_insert_cjenici_bindovima(dto_list: list) -> None:
+    for params in CijenaDTO.as_dict(dto_list):
+        assert list(params) == INSERT_CJENICI_BINDS
+
+
+def test_as_dict_koristi_to_dict(dto_list: list) -> None:
+    assert CijenaDTO.as_dict(dto_list) == [dto.to_dict() for dto in dto_list]
+    assert CijenaDTO.as_dict([]) == []
+
+
+def test_insert_cjenici_iz_env_ima_iste_bindove() -> None:
+    env.read_env()
+    query = env.str("INSERT_CJENICI", None)
+    if query is None:
+        pytest.skip("INSERT_CJENICI nije postavljen u .env")
+
+    # Bind varijable u SQL-u (:naziv), bez ključeva u stringovima (npr. 'HH24:MI')
+    binds = set(re.findall(r"(?<![:\w']):(\w+)", query))
+
+    assert binds == set(INSERT_CJENICI_BINDS)
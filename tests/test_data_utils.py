@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.models.TrgovackiLanci import TrgLanci
+from src.utils.data import data_utils
+
+# Konzum csv sa ISO datumom (PyArrow ga prepoznaje kao datetime.date)
+KONZUM_CSV = (
+    "NAZIV PROIZVODA,ŠIFRA PROIZVODA,MARKA PROIZVODA,NETO KOLIČINA,JEDINICA MJERE,"
+    "MALOPRODAJNA CIJENA,CIJENA ZA JEDINICU MJERE,"
+    "MPC ZA VRIJEME POSEBNOG OBLIKA PRODAJE,NAJNIŽA CIJENA U POSLJEDNIH 30 DANA,"
+    "SIDRENA CIJENA NA 2.5.2025,BARKOD,KATEGORIJA PROIZVODA,DATUM AKCIJE\n"
+    'Mlijeko 2.8%,12, Dukat,1 l,kom,"1,29",1.29,,1.19,1.25,3850000000001,MLIJEKO,2025-01-02\n'
+    "Kruh bijeli,13,,500 g,kom,2.50,5.00,1.99,,,,KRUH,\n"
+    'Jaja M,0014,Farma,10 kom,kom,"3,49",0.35,,3.29,3.39,3850000000018,JAJA,2025-01-03\n'
+)
+
+# Isti csv bez datuma (čita se sa PyArrow engineom)
+KONZUM_CSV_BEZ_DATUMA = "\n".join(
+    line.rsplit(",", 1)[0] for line in KONZUM_CSV.splitlines()
+)
+
+
+@pytest.fixture(params=[KONZUM_CSV, KONZUM_CSV_BEZ_DATUMA], ids=["datum", "bez"])
+def konzum_file(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    file_path = tmp_path / "konzum.csv"
+    file_path.write_text(request.param, encoding="utf-8")
+    return file_path
+
+
+@pytest.mark.parametrize("normalize_prices", [False, True])
+def test_read_data_file_pyarrow_i_c_engine_isti_rezultat(
+    konzum_file: Path, normalize_prices: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("pyarrow")
+
+    df_pyarrow = data_utils.read_data_file(
+        TrgLanci.KONZUM, konzum_file, normalize_prices=normalize_prices
+    )
+
+    monkeypatch.setattr(data_utils, "_PYARROW_DOSTUPAN", False)
+    df_c = data_utils.read_data_file(
+        TrgLanci.KONZUM, konzum_file, normalize_prices=normalize_prices
+    )
+
+    pd.testing.assert_frame_equal(df_pyarrow, df_c)
+
+
+def test_read_csv_pyarrow_ne_vraca_datume(konzum_file: Path) -> None:
+    pytest.importorskip("pyarrow")
+
+    df = data_utils.read_csv_pyarrow(konzum_file, sep=",", header=0)
+
+    if df is not None:
+        assert not data_utils._has_temporal_columns(df)
+
+
+def test_read_data_files_parallel_vraca_datoteke_redom(tmp_path: Path) -> None:
+    paths = []
+    for i in range(20):
+        file_path = tmp_path / f"konzum_{i}.csv"
+        file_path.write_text(
+            KONZUM_CSV_BEZ_DATUMA.replace("Mlijeko", f"Mlijeko {i}"), encoding="utf-8"
+        )
+        paths.append(file_path)
+
+    dataframes = data_utils.read_data_files_parallel(TrgLanci.KONZUM, paths)
+
+    # Generator (datoteke se ne drže sve u memoriji)
+    assert not isinstance(dataframes, list)
+    assert [df.iloc[0, 0] for df in dataframes] == [
+        f"Mlijeko {i} 2.8%" for i in range(20)
+    ]
+    assert list(data_utils.read_data_files_parallel(TrgLanci.KONZUM, [])) == []
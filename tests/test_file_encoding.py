@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.utils.data import data_utils
+from src.utils.file_encoding import (
+    ENCODING_SAMPLE_SIZE,
+    _fix_croatian_csv,
+    detect_encoding,
+    detect_local_file_encoding,
+)
+
+# Csv u windows-1250 encodingu (čita se kao windows-1252 pa se ispravljaju znakovi)
+CSV_1250 = (
+    "Naziv proizvoda;Šifra;Cijena;Datum početka akcije\n"
+    "Čokolada mliječna; 101;1,99;2025-01-02\n"
+    "Žganci;102;;\n"
+    "Sok od šljive;0103;2,49;2025-01-03\n"
+).encode("windows-1250")
+
+
+@pytest.mark.parametrize("sa_datumom", [True, False], ids=["datum", "bez"])
+def test_fix_croatian_csv_pyarrow_i_c_engine_isti_rezultat(
+    sa_datumom: bool, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("pyarrow")
+
+    csv = CSV_1250
+    if not sa_datumom:
+        csv = b"\n".join(line.rsplit(b";", 1)[0] for line in csv.splitlines())
+
+    input_file = tmp_path / "cijene.csv"
+    input_file.write_bytes(csv)
+
+    def fix(output_file: Path) -> pd.DataFrame:
+        return _fix_croatian_csv(
+            str(input_file),
+            separator=";",
+            encoding="windows-1252",
+            file_name=input_file.name,
+            output_file=str(output_file),
+            sep=";",
+            header=0,
+            na_values=[""],
+            skipinitialspace=True,
+            on_bad_lines="warn",
+        )
+
+    df_pyarrow = fix(tmp_path / "pyarrow.csv")
+
+    monkeypatch.setattr(data_utils, "_PYARROW_DOSTUPAN", False)
+    df_c = fix(tmp_path / "c.csv")
+
+    pd.testing.assert_frame_equal(df_pyarrow, df_c)
+    assert (tmp_path / "pyarrow.csv").read_bytes() == (tmp_path / "c.csv").read_bytes()
+    assert "Sok od šljive" in (tmp_path / "c.csv").read_text(encoding="utf-8")
+
+
+def test_detect_local_file_encoding_ascii_pocetak_i_utf8_nakon_uzorka(
+    tmp_path: Path,
+) -> None:
+    file_path = tmp_path / "cijene.csv"
+    ascii_redak = "Naziv;Sifra;Cijena\n" + "Mlijeko;12;1,29\n" * 20_000
+    assert len(ascii_redak) > ENCODING_SAMPLE_SIZE
+    file_path.write_bytes((ascii_redak + "Čokolada;13;1,99\n").encode("utf-8"))
+
+    encoding = detect_local_file_encoding(file_path)
+
+    assert encoding == "utf-8"
+    df = pd.read_csv(file_path, sep=";", encoding=encoding)
+    assert df["Naziv"].iloc[-1] == "Čokolada"
+
+
+def test_detect_encoding_ascii_samo_za_cijelu_datoteku() -> None:
+    assert detect_encoding(b"Naziv;Sifra\nMlijeko;12\n")["encoding"] == "ascii"
+    assert detect_encoding(b"a" * ENCODING_SAMPLE_SIZE)["encoding"] == "utf-8"